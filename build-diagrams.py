@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Build the PlantUML diagrams in diagrams/ as PNG files, skipping up-to-date ones.
+
+Each .puml source is hashed together with the PlantUML version from
+.plantuml-version. The hashes of the last successful build are kept in
+diagrams/png/.build-hashes.json; a diagram is only rebuilt when its hash
+changed or its PNG is missing. All stale diagrams are rendered by a single
+PlantUML invocation (one JVM start, one Docker container), which renders
+them in parallel using PlantUML's own thread pool.
+
+Requirements:
+  - Python 3.9+ (uses only standard library)
+  - Docker or a local plantuml installation
+
+Usage:
+  python3 build-diagrams.py [--engine docker|local] [--force] [--jobs N] [name ...]
+  python3 build-diagrams.py --list
+
+Exit codes:
+  0 - All requested diagrams are up to date
+  1 - PlantUML failed, a diagram is unknown or the engine is not available
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+DIAGRAMS_DIR = ROOT / "diagrams"
+PNG_DIR = DIAGRAMS_DIR / "png"
+HASHES_FILE = PNG_DIR / ".build-hashes.json"
+PLANTUML_LIMIT_SIZE = "8192"
+# PlantUML reports each diagram with a syntax error on stderr like this.
+PLANTUML_ERROR_PATTERN = re.compile(r"^Error line \d+ in file: (.+?)\s*$", re.MULTILINE)
+
+
+def plantuml_version() -> str:
+    """Return the pinned PlantUML version from .plantuml-version."""
+    return (ROOT / ".plantuml-version").read_text(encoding="utf-8").strip()
+
+
+def source_hash(source: Path, version: str) -> str:
+    """Hash a diagram source together with everything that affects its PNG."""
+    digest = hashlib.sha256()
+    digest.update(f"plantuml={version};format=png;limit={PLANTUML_LIMIT_SIZE}\n".encode())
+    digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def load_hashes() -> dict[str, str]:
+    """Load the hashes recorded by the last build (empty if there is none)."""
+    try:
+        with HASHES_FILE.open(encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_hashes(hashes: dict[str, str]) -> None:
+    """Write the build hashes atomically."""
+    tmp = HASHES_FILE.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(dict(sorted(hashes.items())), f, indent=2)
+        f.write("\n")
+    tmp.replace(HASHES_FILE)
+
+
+def available_diagrams() -> list[Path]:
+    """Return all diagram sources in diagrams/."""
+    return sorted(DIAGRAMS_DIR.glob("*.puml"))
+
+
+def engine_available(engine: str) -> bool:
+    """Check whether the given engine can be used."""
+    if engine == "docker":
+        if shutil.which("docker") is None:
+            return False
+        result = subprocess.run(["docker", "info"], capture_output=True, check=False)
+        return result.returncode == 0
+    return shutil.which("plantuml") is not None
+
+
+def plantuml_command(engine: str, sources: list[Path], jobs: int) -> list[str]:
+    """Build the command line rendering all sources in one PlantUML run."""
+    options = ["-tpng", "-nbthread", str(jobs)]
+    if engine == "docker":
+        image = f"plantuml/plantuml:{plantuml_version()}"
+        return [
+            "docker", "run", "--rm",
+            "-v", f"{DIAGRAMS_DIR}:/data",
+            "-e", f"PLANTUML_LIMIT_SIZE={PLANTUML_LIMIT_SIZE}",
+            image,
+            *options, "-o", "/data/png",
+            *(f"/data/{source.name}" for source in sources),
+        ]
+    return ["plantuml", *options, "-o", str(PNG_DIR), *(str(source) for source in sources)]
+
+
+def ensure_docker_image() -> None:
+    """Pull the pinned PlantUML image if it is not present yet."""
+    image = f"plantuml/plantuml:{plantuml_version()}"
+    inspect = subprocess.run(
+        ["docker", "image", "inspect", image], capture_output=True, check=False
+    )
+    if inspect.returncode != 0:
+        print("Pulling Docker image...")
+        subprocess.run(["docker", "pull", image], check=True)
+
+
+def main() -> int:
+    """Build stale PlantUML diagrams."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("names", nargs="*", help="diagrams to build (default: all)")
+    parser.add_argument("--engine", choices=["docker", "local"], default="docker")
+    parser.add_argument("--force", action="store_true", help="rebuild up-to-date diagrams")
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1,
+        help="number of diagrams PlantUML renders in parallel (default: CPU count)",
+    )
+    parser.add_argument("--list", action="store_true", help="list available diagrams")
+    args = parser.parse_args()
+
+    sources = available_diagrams()
+    if args.list:
+        for source in sources:
+            print(source.stem)
+        return 0
+
+    if args.names:
+        by_name = {source.stem: source for source in sources}
+        unknown = [name for name in args.names if name not in by_name]
+        if unknown:
+            for name in unknown:
+                print(f"Error: Diagram not found: {DIAGRAMS_DIR / (name + '.puml')}")
+            print("\nAvailable diagrams:")
+            for source in sources:
+                print(f"  {source.stem}")
+            return 1
+        sources = [by_name[name] for name in args.names]
+
+    version = plantuml_version()
+    hashes = load_hashes()
+    current = {source.name: source_hash(source, version) for source in sources}
+    stale = [
+        source for source in sources
+        if args.force
+        or hashes.get(source.name) != current[source.name]
+        or not (PNG_DIR / f"{source.stem}.png").exists()
+    ]
+
+    if not stale:
+        print(f"All {len(sources)} diagram(s) are up to date.")
+        return 0
+
+    if not engine_available(args.engine):
+        if args.engine == "docker":
+            print("Error: Docker is not available.")
+        else:
+            print("Error: plantuml is not installed.")
+            print("Install with: brew install plantuml")
+        return 1
+
+    PNG_DIR.mkdir(parents=True, exist_ok=True)
+    if args.engine == "docker":
+        ensure_docker_image()
+        print(f"Building {len(stale)} of {len(sources)} diagram(s) using Docker (plantuml/plantuml:{version})...")
+    else:
+        print(f"Building {len(stale)} of {len(sources)} diagram(s) using local plantuml...")
+    for count, source in enumerate(stale, start=1):
+        print(f"[{count}/{len(stale)}] {source.name}")
+
+    started = time.time()
+    env = {**os.environ, "PLANTUML_LIMIT_SIZE": PLANTUML_LIMIT_SIZE}
+    result = subprocess.run(
+        plantuml_command(args.engine, stale, max(1, args.jobs)),
+        env=env, stderr=subprocess.PIPE, text=True, check=False,
+    )
+    sys.stderr.write(result.stderr)
+
+    # Only record diagrams whose PNG was actually written by this run, so a
+    # failing diagram is retried next time while the others stay cached.
+    # PlantUML also writes a PNG showing the error for a diagram with a syntax
+    # error, so the diagrams it reports on stderr are not recorded either. If
+    # it failed without naming a diagram, none of the stale diagrams is.
+    errors = {Path(path).name for path in PLANTUML_ERROR_PATTERN.findall(result.stderr)}
+    reliable = result.returncode == 0 or bool(errors)
+    built = 0
+    failed = []
+    for source in stale:
+        png = PNG_DIR / f"{source.stem}.png"
+        if (
+            reliable
+            and source.name not in errors
+            and png.exists()
+            and png.stat().st_mtime >= started - 1
+        ):
+            hashes[source.name] = current[source.name]
+            built += 1
+        else:
+            hashes.pop(source.name, None)
+            failed.append(source.name)
+    save_hashes(hashes)
+
+    if result.returncode != 0 or failed:
+        print(f"Error: PlantUML failed (exit code {result.returncode}).")
+        for name in failed:
+            print(f"  not recorded as built: {name}")
+        return 1
+
+    print(f"Done. Built {built} diagram(s), {len(sources) - built} up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Build the offline id registry mapping every schema $id to a local document.
+
+The registry contains an index.json mapping each $id of all version
+directories (and the `latest/` alias URLs) to a relative path, plus a copy of
+every schema document. Load it with id_registry.IdRegistry to let validators
+resolve all $refs from disk without HTTP requests.
+
+Requirements:
+  - Python 3.10+ (uses only standard library)
+
+Usage:
+  python3 build-id-registry.py [output-directory]
+
+  The default output directory is _build/id-registry.
+
+Exit codes:
+  0 - Registry built
+  1 - Script error
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+from id_registry import INDEX_FILE, build_index
+from schema_registry import ROOT
+
+
+def main() -> int:
+    """Build the offline id registry."""
+    out_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("_build") / "id-registry"
+
+    index = build_index(ROOT)
+    documents: dict[str, str] = index["documents"]  # type: ignore[assignment]
+    if not documents:
+        print("No schema files found in directories starting with 'v'", file=sys.stderr)
+        return 1
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+
+    # Copy every document once (latest aliases share the versioned file),
+    # ASCII-escaped like the JSON files published with the HTML documentation.
+    for relpath in sorted(set(documents.values())):
+        with (ROOT / relpath).open(encoding="utf-8") as f:
+            data = json.load(f)
+        target = out_dir / relpath
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=True)
+            f.write("\n")
+
+    with (out_dir / INDEX_FILE).open("w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+
+    print(f"Generated {out_dir / INDEX_FILE} ({len(documents)} ids, latest: {index['latest']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Compute statistics and a data-quality report over a corpus of metadata instances.
+
+The fields to look at are derived from the schema version each instance
+declares:
+
+  - the distribution of all enum values (discipline, target-group,
+    competency, blooms-category, ...)
+  - all ISO 8601 durations (time-required of case studies and chapters):
+    total, mean, min, max and a histogram
+  - the share of plain vs. multilingual values of all multilingual-text fields
+    and the languages used
+  - how often optional fields (e.g. supplemented-by, chapter-level language)
+    are missing
+  - schema validation errors, grouped by field
+
+Instance files are streamed one instance at a time by a pool of worker
+processes. Each worker aggregates a batch of files (or a byte range of a large
+NDJSON file) into a partial result that is merged into the total, so memory
+use does not grow with the size of the corpus.
+
+Requirements:
+  - Python 3.10+
+  - PyYAML for YAML instance files (see requirements.txt)
+
+Usage:
+  python3 corpus-stats.py [--workers N] [--output DIR] <file-or-directory> [...]
+
+  Writes corpus-stats.json and corpus-stats.html to DIR
+  (default: _build/corpus-stats).
+
+Exit codes:
+  0 - Report generated
+  1 - No instance files found or script error
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from multiprocessing import Pool
+from pathlib import Path
+
+from instance_io import (
+    NDJSON_SUFFIXES,
+    find_instance_files,
+    iter_instances,
+    iter_ndjson_lines,
+    split_ndjson,
+    split_path,
+    values_at,
+)
+from schema_registry import SchemaRegistry, SchemaVersion, UnknownSchemaVersionError, parse_duration
+
+MULTILINGUAL_TEXT = "multilingual-text.json"
+LANGUAGE_KEY = re.compile(r"^[a-z][a-z]$")
+FILES_PER_TASK = 64
+NDJSON_CHUNK_BYTES = 32 * 1024 * 1024
+MAX_READ_ERRORS = 20
+
+# Upper bounds (in seconds) of the duration histogram buckets
+DURATION_BUCKETS = [
+    (15 * 60, "≤ 15 min"),
+    (30 * 60, "≤ 30 min"),
+    (60 * 60, "≤ 1 h"),
+    (2 * 3600, "≤ 2 h"),
+    (4 * 3600, "≤ 4 h"),
+    (8 * 3600, "≤ 8 h"),
+    (24 * 3600, "≤ 1 d"),
+    (float("inf"), "> 1 d"),
+]
+
+
+class SchemaFields:
+    """The instance paths of the fields the report looks at, for one schema version.
+
+    Paths use property names separated by '.' and '[]' for array items,
+    e.g. 'chapters[].learning-objectives[].competency'.
+    """
+
+    def __init__(self, schema: SchemaVersion):
+        """Collect the fields by walking the schema graph from schema.json."""
+        self.schema = schema
+        self.enums: dict[str, list[object]] = {}
+        self.durations: list[str] = []
+        self.multilingual: list[str] = []
+        self.optional: dict[str, list[str]] = {}
+        self._walk(schema.document("schema.json"), "", set())
+        self.paths = {
+            path: split_path(path)
+            for path in [*self.enums, *self.durations, *self.multilingual, *self.optional]
+        }
+
+    def _walk(self, node: object, path: str, seen: set[tuple[str, str]]) -> None:
+        if not isinstance(node, dict):
+            return
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            filename = ref.split("#")[0].rsplit("/", 1)[-1]
+            if filename == MULTILINGUAL_TEXT:
+                if path not in self.multilingual:
+                    self.multilingual.append(path)
+            elif (filename, path) not in seen:
+                seen.add((filename, path))
+                self._walk(self.schema.document(filename), path, seen)
+        if "enum" in node and path not in self.enums:
+            self.enums[path] = node["enum"]
+        if node.get("format") == "duration" and path not in self.durations:
+            self.durations.append(path)
+        properties = node.get("properties")
+        if isinstance(properties, dict):
+            required = set(node.get("required", []))
+            optional = [name for name in properties if name not in required]
+            if optional:
+                self.optional.setdefault(path, [])
+                self.optional[path] += [name for name in optional if name not in self.optional[path]]
+            for name, subschema in properties.items():
+                self._walk(subschema, f"{path}.{name}" if path else name, seen)
+        items = node.get("items")
+        if isinstance(items, dict):
+            self._walk(items, f"{path}[]", seen)
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            for subschema in node.get(keyword, []):
+                self._walk(subschema, path, seen)
+
+
+def _is_multilingual(value: object) -> bool:
+    return isinstance(value, dict) and bool(value) and all(
+        isinstance(key, str) and LANGUAGE_KEY.match(key) and isinstance(text, str)
+        for key, text in value.items()
+    )
+
+
+class DurationStats:
+    """Mergeable aggregate of ISO 8601 durations."""
+
+    def __init__(self) -> None:
+        """Create an empty aggregate."""
+        self.count = 0
+        self.invalid = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.histogram: Counter[str] = Counter()
+
+    def add(self, value: object) -> None:
+        """Add one duration value."""
+        seconds = parse_duration(value) if isinstance(value, str) else None
+        if seconds is None:
+            self.invalid += 1
+            return
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        self.histogram[next(label for bound, label in DURATION_BUCKETS if seconds <= bound)] += 1
+
+    def merge(self, other: "DurationStats") -> None:
+        """Add the values aggregated by another instance."""
+        self.count += other.count
+        self.invalid += other.invalid
+        self.total += other.total
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+        self.histogram.update(other.histogram)
+
+    def to_dict(self) -> dict[str, object]:
+        """Return the aggregate as JSON-serializable dict (durations in seconds)."""
+        return {
+            "count": self.count,
+            "invalid": self.invalid,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else None,
+            "min_seconds": self.min,
+            "max_seconds": self.max,
+            "histogram": {label: self.histogram[label] for _, label in DURATION_BUCKETS},
+        }
+
+
+class CorpusStats:
+    """Mergeable statistics over a set of instances."""
+
+    def __init__(self) -> None:
+        """Create empty statistics."""
+        self.instances = 0
+        self.invalid = 0
+        self.versions: Counter[str] = Counter()
+        self.enums: dict[str, Counter[str]] = {}
+        self.durations: dict[str, DurationStats] = {}
+        self.texts: dict[str, Counter[str]] = {}
+        self.languages: Counter[str] = Counter()
+        self.optional: dict[str, Counter[str]] = {}
+        self.errors: Counter[str] = Counter()
+        self.read_errors: list[str] = []
+        self.read_error_count = 0
+
+    def add(self, instance: object, registry: SchemaRegistry, fields_cache: dict[str, SchemaFields]) -> None:
+        """Add one instance."""
+        self.instances += 1
+        try:
+            schema = registry.for_instance(instance)
+        except UnknownSchemaVersionError:
+            self.versions["(unknown)"] += 1
+            self.invalid += 1
+            self.errors["schema-version"] += 1
+            return
+        self.versions[schema.version] += 1
+
+        errors = schema.validate(instance)
+        if errors:
+            self.invalid += 1
+            # Group errors by field: "chapters[3].url: ..." -> "chapters[].url"
+            self.errors.update({re.sub(r"\[\d+\]", "[]", error.split(":", 1)[0]) for error in errors})
+
+        fields = fields_cache.get(schema.version)
+        if fields is None:
+            fields = fields_cache[schema.version] = SchemaFields(schema)
+        paths = fields.paths
+
+        for path in fields.enums:
+            counter = self.enums.setdefault(path, Counter())
+            for value in values_at(instance, paths[path]):
+                counter[value if isinstance(value, str) else json.dumps(value)] += 1
+        for path in fields.durations:
+            stats = self.durations.setdefault(path, DurationStats())
+            for value in values_at(instance, paths[path]):
+                stats.add(value)
+        for path in fields.multilingual:
+            counter = self.texts.setdefault(path, Counter())
+            for value in values_at(instance, paths[path]):
+                if isinstance(value, str):
+                    counter["plain"] += 1
+                elif _is_multilingual(value):
+                    counter["multilingual"] += 1
+                    self.languages.update(value.keys())  # type: ignore[union-attr]
+        for path, names in fields.optional.items():
+            for value in values_at(instance, paths[path]):
+                if isinstance(value, dict):
+                    for name in names:
+                        counter = self.optional.setdefault(f"{path}.{name}" if path else name, Counter())
+                        counter["present" if name in value else "missing"] += 1
+
+    def add_read_error(self, message: str) -> None:
+        """Record an unreadable file or instance."""
+        self.read_error_count += 1
+        if len(self.read_errors) < MAX_READ_ERRORS:
+            self.read_errors.append(message)
+
+    def merge(self, other: "CorpusStats") -> None:
+        """Add the statistics of another (partial) result."""
+        self.instances += other.instances
+        self.invalid += other.invalid
+        self.versions.update(other.versions)
+        for target, source in ((self.enums, other.enums), (self.texts, other.texts), (self.optional, other.optional)):
+            for path, counter in source.items():
+                target.setdefault(path, Counter()).update(counter)
+        for path, stats in other.durations.items():
+            self.durations.setdefault(path, DurationStats()).merge(stats)
+        self.languages.update(other.languages)
+        self.errors.update(other.errors)
+        self.read_error_count += other.read_error_count
+        self.read_errors.extend(other.read_errors[: MAX_READ_ERRORS - len(self.read_errors)])
+
+    def to_dict(self) -> dict[str, object]:
+        """Return the statistics as JSON-serializable dict."""
+        return {
+            "instances": self.instances,
+            "invalid": self.invalid,
+            "schema_versions": dict(self.versions.most_common()),
+            "enums": {path: dict(counter.most_common()) for path, counter in self.enums.items()},
+            "durations": {path: stats.to_dict() for path, stats in self.durations.items()},
+            "multilingual_text": {
+                path: {"plain": counter["plain"], "multilingual": counter["multilingual"]}
+                for path, counter in self.texts.items()
+            },
+            "languages": dict(self.languages.most_common()),
+            "optional_fields": {
+                path: {"present": counter["present"], "missing": counter["missing"]}
+                for path, counter in self.optional.items()
+            },
+            "validation_errors": dict(self.errors.most_common()),
+            "read_errors": {"count": self.read_error_count, "examples": self.read_errors},
+        }
+
+
+# ─── Worker processes ─────────────────────────────────────
+
+_registry: SchemaRegistry | None = None
+_fields: dict[str, SchemaFields] = {}
+
+# A task is a list of (path, start, end) entries; start/end are a byte range
+# for NDJSON files and (0, -1) for whole files.
+Task = list[tuple[str, int, int]]
+
+
+def _init_worker() -> None:
+    global _registry
+    _registry = SchemaRegistry()
+
+
+def process_task(task: Task) -> CorpusStats:
+    """Aggregate the instances of one task into a partial result."""
+    assert _registry is not None
+    stats = CorpusStats()
+    for filename, start, end in task:
+        filepath = Path(filename)
+        try:
+            if end >= 0:
+                # A malformed line is recorded and skipped; the rest of the range is still read.
+                for number, line in enumerate(iter_ndjson_lines(filepath, start, end), 1):
+                    try:
+                        instance = json.loads(line)
+                    except ValueError as e:
+                        label = f"line {number} after byte {start}" if start else f"line {number}"
+                        stats.add_read_error(f"{filepath}: {label}: {e}")
+                        continue
+                    stats.add(instance, _registry, _fields)
+            else:
+                for _, instance in iter_instances(filepath):
+                    stats.add(instance, _registry, _fields)
+        except (OSError, ValueError) as e:
+            stats.add_read_error(f"{filepath}: {e}")
+    return stats
+
+
+def make_tasks(files: list[Path]) -> list[Task]:
+    """Group small files into tasks and split large NDJSON files into byte ranges."""
+    tasks: list[Task] = []
+    batch: Task = []
+    for filepath in files:
+        if filepath.suffix in NDJSON_SUFFIXES and filepath.exists():
+            tasks.extend([[(str(filepath), start, end)] for start, end in split_ndjson(filepath, NDJSON_CHUNK_BYTES)])
+            continue
+        batch.append((str(filepath), 0, -1))
+        if len(batch) == FILES_PER_TASK:
+            tasks.append(batch)
+            batch = []
+    if batch:
+        tasks.append(batch)
+    return tasks
+
+
+# ─── HTML report ──────────────────────────────────────────
+
+
+def html_escape(text: object) -> str:
+    """Escape HTML special characters."""
+    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def format_seconds(seconds: float | None) -> str:
+    """Format a number of seconds as hours and minutes."""
+    if seconds is None:
+        return "–"
+    minutes = round(seconds / 60)
+    return f"{minutes // 60} h {minutes % 60:02d} min"
+
+
+def share_cell(count: int, total: int) -> str:
+    """Return a table cell with a count, its share and a bar."""
+    share = count / total if total else 0.0
+    return (
+        f'<td class="num">{count}</td>'
+        f'<td class="share"><span class="bar" style="width: {share * 100:.1f}%"></span>'
+        f'<span class="pct">{share:.1%}</span></td>'
+    )
+
+
+def table(headers: list[str], rows: list[str]) -> str:
+    """Return an HTML table."""
+    head = "".join(f"<th>{html_escape(h)}</th>" for h in headers)
+    body = "\n".join(f"  <tr>{row}</tr>" for row in rows) or f'  <tr><td colspan="{len(headers)}">–</td></tr>'
+    return f'<div class="table-wrap">\n<table>\n<thead><tr>{head}</tr></thead>\n<tbody>\n{body}\n</tbody>\n</table>\n</div>'
+
+
+def generate_html(report: dict) -> str:
+    """Generate a self-contained HTML string."""
+    sections = []
+
+    overview = [
+        f'<td class="element-name">Instances</td><td class="num">{report["instances"]}</td>',
+        f'<td class="element-name">Invalid instances</td><td class="num">{report["invalid"]}</td>',
+        f'<td class="element-name">Unreadable files/instances</td><td class="num">{report["read_errors"]["count"]}</td>',
+    ]
+    overview += [
+        f'<td class="element-name">schema-version {html_escape(version)}</td><td class="num">{count}</td>'
+        for version, count in report["schema_versions"].items()
+    ]
+    sections.append(f"<h2>Overview</h2>\n{table(['', 'Count'], overview)}")
+
+    enum_tables = []
+    for path, counts in report["enums"].items():
+        total = sum(counts.values())
+        if not total:
+            continue
+        rows = [f'<td class="element-name">{html_escape(value)}</td>{share_cell(count, total)}' for value, count in counts.items()]
+        enum_tables.append(f"<h3>{html_escape(path)}</h3>\n{table(['Value', 'Count', 'Share'], rows)}")
+    sections.append("<h2>Enum Values</h2>\n" + "\n".join(enum_tables))
+
+    rows = []
+    for path, stats in report["durations"].items():
+        histogram = " · ".join(f"{label}: {count}" for label, count in stats["histogram"].items() if count)
+        rows.append(
+            f'<td class="element-name">{html_escape(path)}</td><td class="num">{stats["count"]}</td>'
+            f'<td class="num">{stats["invalid"]}</td><td class="num">{format_seconds(stats["total_seconds"])}</td>'
+            f'<td class="num">{format_seconds(stats["mean_seconds"])}</td><td class="num">{format_seconds(stats["min_seconds"])}</td>'
+            f'<td class="num">{format_seconds(stats["max_seconds"])}</td><td>{html_escape(histogram)}</td>'
+        )
+    sections.append(
+        "<h2>Durations (time-required)</h2>\n"
+        + table(["Field", "Count", "Invalid", "Total", "Mean", "Min", "Max", "Histogram"], rows)
+    )
+
+    rows = []
+    for path, counts in report["multilingual_text"].items():
+        total = counts["plain"] + counts["multilingual"]
+        if total:
+            rows.append(
+                f'<td class="element-name">{html_escape(path)}</td><td class="num">{counts["plain"]}</td>'
+                f"{share_cell(counts['multilingual'], total)}"
+            )
+    languages = sum(report["languages"].values())
+    language_rows = [
+        f'<td class="element-name">{html_escape(language)}</td>{share_cell(count, languages)}'
+        for language, count in report["languages"].items()
+    ]
+    sections.append(
+        "<h2>Multilingual Text</h2>\n"
+        + table(["Field", "Plain", "Multilingual", "Share multilingual"], rows)
+        + "\n<h3>Languages used in multilingual values</h3>\n"
+        + table(["Language", "Count", "Share"], language_rows)
+    )
+
+    rows = []
+    for path, counts in report["optional_fields"].items():
+        total = counts["present"] + counts["missing"]
+        if total:
+            rows.append(
+                f'<td class="element-name">{html_escape(path)}</td><td class="num">{total}</td>'
+                f"{share_cell(counts['missing'], total)}"
+            )
+    sections.append("<h2>Missing Optional Fields</h2>\n" + table(["Field", "Objects", "Missing", "Share missing"], rows))
+
+    rows = [
+        f'<td class="element-name">{html_escape(path or "(root)")}</td>{share_cell(count, report["instances"])}'
+        for path, count in report["validation_errors"].items()
+    ]
+    rows += [f'<td class="element-name" colspan="3">{html_escape(message)}</td>' for message in report["read_errors"]["examples"]]
+    sections.append("<h2>Validation Errors</h2>\n" + table(["Field", "Instances", "Share"], rows))
+
+    body = "\n".join(sections)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>QUADRIGA Schema – Corpus Statistics</title>
+<style>
+  body {{
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+    margin: 1rem;
+    background: #fafafa;
+    text-align: center;
+  }}
+  h1 {{ font-size: 1.4rem; margin-bottom: 0.5rem; }}
+  h2 {{ font-size: 1.15rem; margin-top: 2rem; }}
+  h3 {{ font-size: 0.95rem; margin-top: 1.25rem; color: #555; }}
+  .table-wrap {{
+    overflow-x: auto;
+  }}
+  .table-wrap table {{
+    margin: 0 auto;
+  }}
+  table {{
+    border-collapse: collapse;
+    font-size: 0.85rem;
+  }}
+  th, td {{
+    border: 1.5px solid #333;
+    padding: 4px 8px;
+    text-align: center;
+    white-space: nowrap;
+    vertical-align: middle;
+  }}
+  thead th {{
+    background: #333;
+    color: #fff;
+    border-color: #333;
+  }}
+  .element-name {{
+    background: #f0f0f0;
+    text-align: left;
+    font-weight: 600;
+  }}
+  .num {{
+    text-align: right;
+    font-variant-numeric: tabular-nums;
+  }}
+  .share {{
+    position: relative;
+    min-width: 160px;
+    text-align: right;
+  }}
+  /* share bar – Okabe-Ito colorblind-safe palette */
+  .bar {{
+    position: absolute;
+    left: 0;
+    top: 0;
+    bottom: 0;
+    background: #56b4e9;
+  }}
+  .pct {{
+    position: relative;
+  }}
+</style>
+</head>
+<body>
+<h1>QUADRIGA Schema – Corpus Statistics</h1>
+{body}
+</body>
+</html>"""
+
+
+def main() -> int:
+    """Compute corpus statistics and write the JSON and HTML report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="+", help="instance files or directories")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", type=Path, default=Path("_build") / "corpus-stats")
+    args = parser.parse_args()
+
+    files = find_instance_files(args.paths)
+    if not files:
+        print("No instance files found", file=sys.stderr)
+        return 1
+
+    tasks = make_tasks(files)
+    print(f"Processing {len(files)} file(s) in {len(tasks)} task(s) with {args.workers} worker(s)...")
+
+    total = CorpusStats()
+    if args.workers > 1:
+        with Pool(args.workers, initializer=_init_worker) as pool:
+            for partial in pool.imap_unordered(process_task, tasks):
+                total.merge(partial)
+    else:
+        _init_worker()
+        for task in tasks:
+            total.merge(process_task(task))
+
+    report = total.to_dict()
+    args.output.mkdir(parents=True, exist_ok=True)
+    json_path = args.output / "corpus-stats.json"
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    html_path = args.output / "corpus-stats.html"
+    html_path.write_text(generate_html(report), encoding="utf-8")
+
+    print(f"Instances: {total.instances} ({total.invalid} invalid, {total.read_error_count} unreadable)")
+    print(f"Generated {json_path}")
+    print(f"Generated {html_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
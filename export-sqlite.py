@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Export a corpus of QUADRIGA metadata instances into an indexed SQLite database.
+
+Instances are mapped into normalized tables for ad-hoc analytics:
+
+  documents            one row per instance: source file, position, content hash, raw JSON
+  case_studies         the case study itself (id = documents.id)
+  persons              authors and contributors, deduplicated by ORCID or name
+  case_study_persons   who is author/contributor of which case study
+  chapters             chapters of a case study
+  learning_objectives  learning objectives of a chapter
+  keywords             keywords (one row per language of multilingual keywords)
+  licenses             content and code licenses
+  classifications      discipline, research-object-type and target-group values
+
+Multilingual text columns hold the German text (or the first language given);
+the complete instance is kept as JSON in documents.content and can be queried
+with SQLite's JSON functions.
+
+Every NDJSON line and every document of a multi-document YAML file is
+stored as an instance of its own; its position is the line or document
+number within the file.
+
+Loading is incremental: every instance is stored with the SHA-256 hash of its
+source text, and on the next run only new or changed instances are parsed and
+written. Stored instances are matched by hash within their source, so an
+instance that merely moved (e.g. after a line was deleted above it) only has
+its position updated. Sources are identified by their absolute path. The
+database mirrors the given paths: instances that are no longer part of them
+are removed. Files are read and parsed by a pool of worker processes; rows
+are written in bulk transactions.
+
+Requirements:
+  - Python 3.10+
+  - PyYAML for YAML instance files (see requirements.txt)
+
+Usage:
+  python3 export-sqlite.py [--database FILE] [--workers N] <file-or-directory> [...]
+
+  The default database is _build/metadata.sqlite.
+
+Exit codes:
+  0 - Export complete
+  1 - Files could not be read or script error
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from collections import Counter
+from multiprocessing import Pool
+from pathlib import Path
+
+from instance_io import NDJSON_SUFFIXES, find_instance_files, parse_instances
+from schema_registry import parse_duration
+
+BATCH_SIZE = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    content TEXT NOT NULL,
+    UNIQUE (source, position)
+);
+CREATE TABLE IF NOT EXISTS case_studies (
+    id INTEGER PRIMARY KEY REFERENCES documents (id) ON DELETE CASCADE,
+    title TEXT,
+    description TEXT,
+    identifier TEXT,
+    git TEXT,
+    url TEXT,
+    language TEXT,
+    time_required TEXT,
+    time_required_seconds REAL,
+    date_issued TEXT,
+    date_modified TEXT,
+    version TEXT,
+    schema_version TEXT,
+    learning_resource_type TEXT
+);
+CREATE TABLE IF NOT EXISTS persons (
+    id INTEGER PRIMARY KEY,
+    person_key TEXT NOT NULL UNIQUE,
+    given_names TEXT,
+    family_names TEXT,
+    orcid TEXT
+);
+CREATE TABLE IF NOT EXISTS case_study_persons (
+    case_study_id INTEGER NOT NULL REFERENCES case_studies (id) ON DELETE CASCADE,
+    person_id INTEGER NOT NULL REFERENCES persons (id),
+    role TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    credit TEXT
+);
+CREATE TABLE IF NOT EXISTS chapters (
+    id INTEGER PRIMARY KEY,
+    case_study_id INTEGER NOT NULL REFERENCES case_studies (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    description TEXT,
+    url TEXT,
+    time_required TEXT,
+    time_required_seconds REAL,
+    learning_goal TEXT,
+    language TEXT
+);
+CREATE TABLE IF NOT EXISTS learning_objectives (
+    id INTEGER PRIMARY KEY,
+    chapter_id INTEGER NOT NULL REFERENCES chapters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    learning_objective TEXT,
+    competency TEXT,
+    data_flow TEXT,
+    blooms_category TEXT,
+    assessment TEXT
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    case_study_id INTEGER NOT NULL REFERENCES case_studies (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    language TEXT
+);
+CREATE TABLE IF NOT EXISTS licenses (
+    case_study_id INTEGER NOT NULL REFERENCES case_studies (id) ON DELETE CASCADE,
+    scope TEXT NOT NULL,
+    name TEXT,
+    url TEXT
+);
+CREATE TABLE IF NOT EXISTS classifications (
+    case_study_id INTEGER NOT NULL REFERENCES case_studies (id) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_case_studies_schema_version ON case_studies (schema_version);
+CREATE INDEX IF NOT EXISTS idx_case_studies_date_issued ON case_studies (date_issued);
+CREATE INDEX IF NOT EXISTS idx_persons_orcid ON persons (orcid);
+CREATE INDEX IF NOT EXISTS idx_persons_name ON persons (family_names, given_names);
+CREATE INDEX IF NOT EXISTS idx_case_study_persons_case_study ON case_study_persons (case_study_id);
+CREATE INDEX IF NOT EXISTS idx_case_study_persons_person ON case_study_persons (person_id, role);
+CREATE INDEX IF NOT EXISTS idx_chapters_case_study ON chapters (case_study_id);
+CREATE INDEX IF NOT EXISTS idx_learning_objectives_chapter ON learning_objectives (chapter_id);
+CREATE INDEX IF NOT EXISTS idx_learning_objectives_competency ON learning_objectives (competency);
+CREATE INDEX IF NOT EXISTS idx_learning_objectives_blooms_category ON learning_objectives (blooms_category);
+CREATE INDEX IF NOT EXISTS idx_keywords_case_study ON keywords (case_study_id);
+CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords (keyword);
+CREATE INDEX IF NOT EXISTS idx_licenses_case_study ON licenses (case_study_id);
+CREATE INDEX IF NOT EXISTS idx_licenses_url ON licenses (url);
+CREATE INDEX IF NOT EXISTS idx_classifications_case_study ON classifications (case_study_id);
+CREATE INDEX IF NOT EXISTS idx_classifications_value ON classifications (field, value);
+"""
+
+CLASSIFICATION_FIELDS = ["discipline", "research-object-type", "target-group"]
+
+
+def scalar(value: object) -> str | int | float | None:
+    """Return a value that fits a single column, or None for lists and objects.
+
+    Instances are exported whether they are valid or not, so a property of
+    the wrong type must not abort the export.
+    """
+    if isinstance(value, int) and not -(2**63) <= value < 2**63:
+        return None  # outside SQLite's INTEGER range
+    return value if isinstance(value, (str, int, float)) else None
+
+
+def text(value: object) -> str | None:
+    """Return a multilingual-text value as plain text (German if available)."""
+    if isinstance(value, dict):
+        value = value.get("de") or next(iter(value.values()), None)
+    return value if isinstance(value, str) else None
+
+
+def as_list(value: object) -> list[object]:
+    """Return a value that may be a single item or a list of items as a list."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def joined(value: object) -> str | None:
+    """Return a string or list of strings (e.g. language) as comma-separated text."""
+    values = [item for item in as_list(value) if isinstance(item, str)]
+    return ",".join(values) if values else None
+
+
+def duration_seconds(value: object) -> float | None:
+    """Return an ISO 8601 duration in seconds."""
+    return parse_duration(value) if isinstance(value, str) else None
+
+
+# ─── Worker processes ─────────────────────────────────────
+
+# A parsed entry is (position, content_hash, content_json); content_json is
+# None for instances whose hash is already stored.
+Entry = tuple[int, str, str | None]
+
+
+def read_file(task: tuple[str, list[str]]) -> tuple[str, list[Entry], str | None]:
+    """Hash the instances of a file and parse those whose hash is not stored.
+
+    NDJSON lines are hashed one by one. The documents of a YAML or JSON file
+    share the hash of the file, suffixed with ":<position>" if the file holds
+    more than one document. Returns the source, its entries and an error
+    message if the file could not be read.
+    """
+    source, stored_hashes = task
+    filepath = Path(source)
+    known = Counter(stored_hashes)
+    entries: list[Entry] = []
+    try:
+        data = filepath.read_bytes()
+        if filepath.suffix in NDJSON_SUFFIXES:
+            lines = (line for line in data.splitlines() if line.strip())
+            for position, raw in enumerate(lines):
+                content_hash = hashlib.sha256(raw).hexdigest()
+                if known[content_hash] > 0:
+                    known[content_hash] -= 1
+                    entries.append((position, content_hash, None))
+                else:
+                    content = json.dumps(json.loads(raw), ensure_ascii=False)
+                    entries.append((position, content_hash, content))
+            return source, entries, None
+
+        file_hash = hashlib.sha256(data).hexdigest()
+        if file_hash in known:
+            return source, [(0, file_hash, None)], None
+        documents = sum(1 for content_hash in known if content_hash.startswith(f"{file_hash}:"))
+        if documents:
+            return source, [(position, f"{file_hash}:{position}", None) for position in range(documents)], None
+        instances = list(parse_instances(data, filepath.suffix))
+        if not instances:
+            return source, [], "no instance found"
+        for position, instance in enumerate(instances):
+            content_hash = file_hash if len(instances) == 1 else f"{file_hash}:{position}"
+            entries.append((position, content_hash, json.dumps(instance, ensure_ascii=False)))
+    except (OSError, ValueError) as e:
+        return source, [], str(e)
+    return source, entries, None
+
+
+# ─── Database ─────────────────────────────────────────────
+
+
+class Exporter:
+    """Write instances into the normalized tables."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        """Create an exporter writing to an open database connection."""
+        self.db = connection
+        self._person_ids: dict[str, int] = dict(self.db.execute("SELECT person_key, id FROM persons"))
+
+    def known_documents(self) -> dict[str, list[tuple[int, int, str]]]:
+        """Return (id, position, content hash) of all stored instances by source."""
+        known: dict[str, list[tuple[int, int, str]]] = {}
+        for document_id, source, position, content_hash in self.db.execute(
+            "SELECT id, source, position, content_hash FROM documents"
+        ):
+            known.setdefault(source, []).append((document_id, position, content_hash))
+        return known
+
+    def person_id(self, person: dict[str, object]) -> int:
+        """Return the id of a person, inserting it if it is new."""
+        orcid = person.get("orcid") if isinstance(person.get("orcid"), str) else None
+        given, family = text(person.get("given-names")), text(person.get("family-names"))
+        key = f"orcid:{orcid}" if orcid else f"name:{family}|{given}"
+        person_id = self._person_ids.get(key)
+        if person_id is None:
+            cursor = self.db.execute(
+                "INSERT INTO persons (person_key, given_names, family_names, orcid) VALUES (?, ?, ?, ?)",
+                (key, given, family, orcid),
+            )
+            person_id = self._person_ids[key] = cursor.lastrowid  # type: ignore[assignment]
+        return person_id  # type: ignore[return-value]
+
+    def delete(self, source: str) -> None:
+        """Delete all stored instances of a source."""
+        self.db.execute("DELETE FROM documents WHERE source = ?", (source,))
+
+    def delete_documents(self, document_ids: list[int]) -> None:
+        """Delete single stored instances by document id."""
+        self.db.executemany("DELETE FROM documents WHERE id = ?", [(i,) for i in document_ids])
+
+    def move(self, moves: list[tuple[int, int]]) -> None:
+        """Update the positions of stored instances given as (document id, new position)."""
+        # Positions are unique within a source, so moved instances are parked
+        # on (unused) negative positions first.
+        self.db.executemany("UPDATE documents SET position = -id WHERE id = ?", [(i,) for i, _ in moves])
+        self.db.executemany("UPDATE documents SET position = ? WHERE id = ?", [(p, i) for i, p in moves])
+
+    def insert(self, source: str, position: int, content_hash: str, content: str) -> None:
+        """Insert one instance and all its normalized rows."""
+        instance = json.loads(content)
+        if not isinstance(instance, dict):
+            instance = {}
+        cursor = self.db.execute(
+            "INSERT INTO documents (source, position, content_hash, content) VALUES (?, ?, ?, ?)",
+            (source, position, content_hash, content),
+        )
+        case_study_id = cursor.lastrowid
+        self.db.execute(
+            "INSERT INTO case_studies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                case_study_id,
+                text(instance.get("title")),
+                text(instance.get("description")),
+                scalar(instance.get("identifier")),
+                scalar(instance.get("git")),
+                scalar(instance.get("url")),
+                joined(instance.get("language")),
+                scalar(instance.get("time-required")),
+                duration_seconds(instance.get("time-required")),
+                scalar(instance.get("date-issued")),
+                scalar(instance.get("date-modified")),
+                scalar(instance.get("version")),
+                scalar(instance.get("schema-version")),
+                scalar(instance.get("learning-resource-type")),
+            ),
+        )
+
+        person_rows = []
+        for role, field in (("author", "authors"), ("contributor", "contributors")):
+            for index, person in enumerate(as_list(instance.get(field))):
+                if isinstance(person, dict):
+                    credit = person.get("credit")
+                    person_rows.append((
+                        case_study_id, self.person_id(person), role, index,
+                        json.dumps(credit, ensure_ascii=False) if credit is not None else None,
+                    ))
+        self.db.executemany("INSERT INTO case_study_persons VALUES (?, ?, ?, ?, ?)", person_rows)
+
+        for index, chapter in enumerate(as_list(instance.get("chapters"))):
+            if not isinstance(chapter, dict):
+                continue
+            cursor = self.db.execute(
+                "INSERT INTO chapters (case_study_id, position, title, description, url, time_required,"
+                " time_required_seconds, learning_goal, language) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    case_study_id, index,
+                    text(chapter.get("title")),
+                    text(chapter.get("description")),
+                    scalar(chapter.get("url")),
+                    scalar(chapter.get("time-required")),
+                    duration_seconds(chapter.get("time-required")),
+                    text(chapter.get("learning-goal")),
+                    joined(chapter.get("language")),
+                ),
+            )
+            chapter_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO learning_objectives (chapter_id, position, learning_objective, competency,"
+                " data_flow, blooms_category, assessment) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        chapter_id, position,
+                        text(objective.get("learning-objective")),
+                        scalar(objective.get("competency")),
+                        scalar(objective.get("data-flow")),
+                        scalar(objective.get("blooms-category")),
+                        text(objective.get("assessment")),
+                    )
+                    for position, objective in enumerate(as_list(chapter.get("learning-objectives")))
+                    if isinstance(objective, dict)
+                ],
+            )
+
+        keyword_rows = []
+        for index, keyword in enumerate(as_list(instance.get("keywords"))):
+            if isinstance(keyword, dict):
+                keyword_rows.extend(
+                    (case_study_id, index, value, language)
+                    for language, value in keyword.items()
+                    if isinstance(value, str)
+                )
+            elif isinstance(keyword, str):
+                keyword_rows.append((case_study_id, index, keyword, None))
+        self.db.executemany("INSERT INTO keywords VALUES (?, ?, ?, ?)", keyword_rows)
+
+        license_rows = []
+        licenses = instance.get("license")
+        for scope, entry in licenses.items() if isinstance(licenses, dict) else []:
+            if isinstance(entry, dict):
+                license_rows.append((case_study_id, scope, scalar(entry.get("name")), scalar(entry.get("url"))))
+            elif isinstance(entry, str):
+                license_rows.append((case_study_id, scope, None, entry))
+        self.db.executemany("INSERT INTO licenses VALUES (?, ?, ?, ?)", license_rows)
+
+        self.db.executemany(
+            "INSERT INTO classifications VALUES (?, ?, ?)",
+            [
+                (case_study_id, field, value)
+                for field in CLASSIFICATION_FIELDS
+                for value in as_list(instance.get(field))
+                if isinstance(value, str)
+            ],
+        )
+
+    def remove_orphaned_persons(self) -> None:
+        """Delete persons that are no longer referenced by any case study."""
+        self.db.execute(
+            "DELETE FROM persons WHERE id NOT IN (SELECT DISTINCT person_id FROM case_study_persons)"
+        )
+        self._person_ids = dict(self.db.execute("SELECT person_key, id FROM persons"))
+
+
+def connect(database: Path) -> sqlite3.Connection:
+    """Open (and create) the database."""
+    database.parent.mkdir(parents=True, exist_ok=True)
+    # Transactions are managed explicitly to write in large batches.
+    connection = sqlite3.connect(database, isolation_level=None)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def main() -> int:
+    """Export metadata instances into the SQLite database."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="+", help="instance files or directories")
+    parser.add_argument("--database", type=Path, default=Path("_build") / "metadata.sqlite")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    files = find_instance_files(args.paths)
+    connection = connect(args.database)
+    exporter = Exporter(connection)
+    known = exporter.known_documents()
+    # Sources are stored as absolute paths, so that the same corpus given as
+    # "corpus", "./corpus" or "/abs/corpus" is recognized as unchanged.
+    sources = [str(filepath.resolve()) for filepath in files]
+
+    inserted = unchanged = deleted = pending = 0
+    errors: list[str] = []
+    tasks = [(source, [content_hash for _, _, content_hash in known.get(source, [])]) for source in sources]
+
+    connection.execute("BEGIN")
+    # Sources that are no longer part of the corpus
+    for source in set(known) - set(sources):
+        exporter.delete(source)
+        deleted += len(known[source])
+
+    pool = Pool(args.workers) if args.workers > 1 else None
+    try:
+        results = pool.imap(read_file, tasks, chunksize=16) if pool else map(read_file, tasks)
+        for source, entries, error in results:
+            if error is not None:
+                # Keep the previously exported state of unreadable files.
+                errors.append(f"{source}: {error}")
+                continue
+            stored: dict[str, list[tuple[int, int]]] = {}
+            for document_id, position, content_hash in known.get(source, []):
+                stored.setdefault(content_hash, []).append((document_id, position))
+            moves: list[tuple[int, int]] = []
+            for position, content_hash, content in entries:
+                matches = stored.get(content_hash)
+                if content is None and matches:
+                    document_id, stored_position = matches.pop()
+                    if stored_position != position:
+                        moves.append((document_id, position))
+                    unchanged += 1
+            removed = [document_id for matches in stored.values() for document_id, _ in matches]
+            exporter.delete_documents(removed)
+            deleted += len(removed)
+            exporter.move(moves)
+            for position, content_hash, content in entries:
+                if content is not None:
+                    exporter.insert(source, position, content_hash, content)
+                    inserted += 1
+                    pending += 1
+            if pending >= BATCH_SIZE:
+                connection.execute("COMMIT")
+                connection.execute("BEGIN")
+                pending = 0
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    exporter.remove_orphaned_persons()
+    connection.execute("COMMIT")
+    connection.execute("PRAGMA optimize")
+    connection.close()
+
+    for error in errors:
+        print(f"ERROR: Cannot read {error}", file=sys.stderr)
+    print(f"Exported to {args.database}: {inserted} inserted/updated, {unchanged} unchanged, {deleted} removed")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,680 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic, schema-valid QUADRIGA metadata instances for load testing.
+
+The schema graph of a version is compiled into generator functions that honor
+required, enum, const, oneOf/anyOf, pattern, format (uri, date, duration),
+min/maxItems, uniqueItems, minLength and multilingual-text language maps.
+Optional properties are included with a configurable probability.
+
+For speed, values are generated once per seed into pools of pre-rendered JSON
+text, and each instance is assembled from them: one fragment per top-level
+property, and for top-level arrays (authors, chapters, keywords, ...) a run of
+items from a pool of single items, so that the lists hardly repeat. This
+yields tens of thousands of instances per second and core. The properties
+that identify an instance are unique, as in a real corpus: identifier, url
+and git contain the instance number, and titles are joined from two texts.
+The pools hold count/20 values by default (at least 512, at most 16384);
+--pool-size trades start-up time for more distinct values.
+
+Output is deterministic for a given seed, independent of the number of worker
+processes: instances are generated in fixed-size chunks, each seeded from the
+seed and its chunk number, and written in order.
+
+Requirements:
+  - Python 3.10+ (uses only standard library)
+  - PyYAML for YAML output (see requirements.txt)
+
+Usage:
+  python3 generate-instances.py [options] --count N [--output FILE-OR-DIR]
+
+  --format ndjson (default) streams one instance per line to the output file
+  (default: stdout). --format yaml writes one metadata-<n>.yml file per
+  instance into the output directory.
+
+Options:
+  --seed S                  random seed (default: 0)
+  --schema-version V        schema version to generate (default: latest)
+  --chapters MIN-MAX        number of chapters per instance (default: 1-6)
+  --keywords MIN-MAX        number of keywords per instance (default: 1-8)
+  --languages de:3,en:1     languages and their weights (default: de:3,en:1)
+  --multilingual-ratio R    share of multilingual-text values given as language map (default: 0.3)
+  --optional-ratio R        probability of including optional properties (default: 0.5)
+  --pool-size N             pre-rendered values per pool (default: see above)
+  --workers N               worker processes (default: CPU count)
+  --validate                validate every instance (slow; for testing the generator)
+
+Exit codes:
+  0 - Instances generated
+  1 - Invalid options or a generated instance was invalid (--validate)
+"""
+
+import argparse
+import bisect
+import datetime
+import itertools
+import json
+import os
+import random
+import re
+import sys
+from collections.abc import Callable
+from multiprocessing import Pool
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin
+
+try:
+    import re._constants as sre_constants
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+from schema_registry import FORMAT_CHECKERS, SchemaRegistry, SchemaVersion
+
+CHUNK_SIZE = 1000
+TEXT_POOL_SIZE = 4096
+MIN_POOL_SIZE = 512
+MAX_POOL_SIZE = 16384
+ARRAY_ORDERS = 8
+MULTILINGUAL_TEXT = "multilingual-text.json"
+LANGUAGE = "language.json"
+MAX_REPEAT_EXTRA = 3
+UNIQUE_ATTEMPTS = 20
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, check_circular=False)
+
+# Top-level properties generated for every instance from its number instead of
+# being drawn from a pool. 10.5072 is the DOI prefix reserved for testing.
+INSTANCE_URIS = {
+    "identifier": "https://doi.org/10.5072/quadriga.{number}",
+    "url": "https://quadriga.example.org/books/{number}/",
+    "git": "https://git.example.org/quadriga/book-{number}",
+}
+INSTANCE_TEXTS = {"title"}
+LANGUAGE_CODE = re.compile(r"[a-z]{2}")
+
+# Generators take the random number generator of the current chunk.
+Generator = Callable[[random.Random], object]
+# Fragment makers take it and the number of the instance.
+FragmentMaker = Callable[[random.Random, int], str]
+# A root property is rendered from a pool of fragments (with its size) or by
+# a maker; the float is the probability of including it.
+Fragments = tuple[list[str] | None, int, FragmentMaker | None, float]
+
+WORDS = (
+    "Daten Analyse Korpus Forschung Methode Text Tabelle Bild Quelle Archiv Edition "
+    "Metadaten Kompetenz Visualisierung Statistik Modell Werkzeug Verwaltung Digital "
+    "Humanities Reproduzierbarkeit Publikation Qualität Lernziel Kapitel Übung Beispiel "
+    "data analysis corpus research method source archive model tool workflow notebook "
+    "pipeline dataset annotation interpretation evaluation quality open science"
+).split()
+GIVEN_NAMES = "Anna Ben Clara David Emma Felix Greta Hannah Jonas Lea Mia Noah Paul Sophie Tim".split()
+FAMILY_NAMES = "Bauer Fischer Hoffmann Klein Koch Meyer Müller Neumann Richter Schmidt Schneider Wagner Weber Wolf".split()
+DATES = [(datetime.date(2020, 1, 1) + datetime.timedelta(days=day)).isoformat() for day in range(3650)]
+DURATIONS = [
+    "PT" + (f"{minutes // 60}H" if minutes >= 60 else "") + (f"{minutes % 60}M" if minutes % 60 else "")
+    for minutes in (15, 30, 45, 60, 90, 120, 180, 240, 480)
+]
+
+
+def parse_range(text: str) -> tuple[int, int]:
+    """Parse 'MIN-MAX' or 'N' into an inclusive range."""
+    low, _, high = text.partition("-")
+    return int(low), int(high or low)
+
+
+def parse_languages(text: str) -> tuple[list[str], list[float]]:
+    """Parse 'de:3,en:1' into languages and weights.
+
+    Raises ValueError for codes that are not ISO 639-1, duplicate codes and
+    weights that are not positive.
+    """
+    languages, weights = [], []
+    for item in text.split(","):
+        language, _, weight = item.strip().partition(":")
+        if not LANGUAGE_CODE.fullmatch(language):
+            raise ValueError(f"'{language}' is not a two-letter ISO 639-1 language code")
+        if language in languages:
+            raise ValueError(f"language '{language}' is given twice")
+        languages.append(language)
+        weights.append(float(weight or 1))
+        if not weights[-1] > 0:
+            raise ValueError(f"weight of language '{language}' must be positive")
+    return languages, weights
+
+
+# ─── Strings from regular expressions ─────────────────────
+
+
+def compile_pattern(pattern: str) -> Callable[[random.Random], str]:
+    """Compile a regular expression into a generator of matching strings."""
+    return _compile_regex(sre_parse.parse(pattern))
+
+
+def _char_set(items: list) -> list[str]:
+    chars: set[str] = set()
+    negate = False
+    categories = {
+        sre_constants.CATEGORY_DIGIT: "0123456789",
+        sre_constants.CATEGORY_WORD: "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_",
+        sre_constants.CATEGORY_SPACE: " ",
+    }
+    for op, value in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            chars.add(chr(value))
+        elif op == sre_constants.RANGE:
+            chars.update(chr(code) for code in range(value[0], value[1] + 1))
+        elif op == sre_constants.CATEGORY:
+            chars.update(categories.get(value, ""))
+    if negate:
+        chars = {chr(code) for code in range(0x21, 0x7F)} - chars
+    return sorted(chars)
+
+
+def _compile_regex(parsed: list) -> Callable[[random.Random], str]:
+    parts: list[Callable[[random.Random], str]] = []
+    for op, value in parsed:
+        if op == sre_constants.LITERAL:
+            literal = chr(value)
+            if parts and isinstance(getattr(parts[-1], "literal", None), str):
+                # Merge runs of literal characters into one part.
+                literal = parts.pop().literal + literal  # type: ignore[attr-defined]
+            part = lambda rnd, c=literal: c  # noqa: E731
+            part.literal = literal  # type: ignore[attr-defined]
+            parts.append(part)
+        elif op in (sre_constants.IN, sre_constants.NOT_LITERAL, sre_constants.ANY):
+            if op == sre_constants.NOT_LITERAL:
+                chars = _char_set([(sre_constants.NEGATE, None), (sre_constants.LITERAL, value)])
+            elif op == sre_constants.ANY:
+                # Any character matches; a literal '.' keeps URL patterns
+                # such as 'orcid.org' readable.
+                chars = ["."]
+            else:
+                chars = _char_set(value)
+            parts.append(lambda rnd, chars=chars: chars[int(rnd.random() * len(chars))])
+        elif op == sre_constants.BRANCH:
+            branches = [_compile_regex(branch) for branch in value[1]]
+            parts.append(lambda rnd, branches=branches: branches[int(rnd.random() * len(branches))](rnd))
+        elif op == sre_constants.SUBPATTERN:
+            parts.append(_compile_regex(value[-1]))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, "POSSESSIVE_REPEAT", None)):
+            low, high, item = value
+            high = min(high, low + MAX_REPEAT_EXTRA)
+            item_gen = _compile_regex(item)
+            parts.append(
+                lambda rnd, low=low, high=high, item_gen=item_gen: "".join(
+                    [item_gen(rnd) for _ in range(low + int(rnd.random() * (high - low + 1)))]
+                )
+            )
+        # AT (anchors) and lookaround assertions produce no characters.
+    if len(parts) == 1:
+        return parts[0]
+    return lambda rnd: "".join([part(rnd) for part in parts])
+
+
+# ─── Instances from the schema graph ──────────────────────
+
+
+class InstanceGenerator:
+    """Compile the schema graph of a version into an instance generator."""
+
+    def __init__(
+        self,
+        schema: SchemaVersion,
+        array_lengths: dict[str, tuple[int, int]],
+        languages: list[str],
+        language_weights: list[float],
+        multilingual_ratio: float,
+        optional_ratio: float,
+        seed: str,
+        pool_size: int = MIN_POOL_SIZE,
+    ):
+        """Create a generator; array_lengths overrides item counts by schema file name."""
+        self.schema = schema
+        self.pool_size = pool_size
+        self.array_lengths = array_lengths
+        self.languages = languages
+        self.multilingual_ratio = multilingual_ratio
+        self.optional_ratio = optional_ratio
+        total = sum(language_weights)
+        self._language_bounds = list(itertools.accumulate(weight / total for weight in language_weights))[:-1]
+        # Free texts are drawn from a pool generated once per seed; building
+        # every text from single words would dominate the generation time.
+        pool_rnd = random.Random(f"{seed}:texts")
+        self._texts = [" ".join(pool_rnd.choices(WORDS, k=pool_rnd.randint(2, 8))) for _ in range(TEXT_POOL_SIZE)]
+        self._special: dict[str, Generator] = {
+            MULTILINGUAL_TEXT: self._multilingual_text,
+            LANGUAGE: self._language,
+            "given-names.json": self._pick(GIVEN_NAMES),
+            "family-names.json": self._pick(FAMILY_NAMES),
+        }
+        self._compiled: dict[str, Generator] = {}
+        self.generate = self.compile_uri(schema.root_id)
+        self._fragments = self._fragment_pools(seed)
+
+    def _fragment_pools(self, seed: str) -> list[Fragments]:
+        """Compile the root properties into pools or makers of '"name": value' fragments."""
+        root_id = self.schema.root_id
+        root = self.schema.documents[root_id]
+        required = set(root.get("required", []))
+        fragments = []
+        for name, subschema in root.get("properties", {}).items():
+            key = _ENCODER.encode(name) + ": "
+            pool_rnd = random.Random(f"{seed}:{name}")
+            node, base_uri, filename = self._resolve(subschema, root_id)
+            items = node.get("items")
+            pool = None
+            if name in INSTANCE_URIS:
+                maker = self._instance_uri(key, INSTANCE_URIS[name])
+            elif name in INSTANCE_TEXTS:
+                maker = self._instance_text(key, filename == MULTILINGUAL_TEXT)
+            elif node.get("type") == "array" and isinstance(items, dict) and not self._is_enum(items, base_uri):
+                maker = self._array_fragments(key, node, base_uri, filename, pool_rnd)
+            else:
+                generator = self.compile(subschema, root_id)
+                pool = [key + _ENCODER.encode(generator(pool_rnd)) for _ in range(self.pool_size)]
+                maker = None
+            size = len(pool) if pool is not None else 0
+            fragments.append((pool, size, maker, 1.0 if name in required else self.optional_ratio))
+        return fragments
+
+    def _resolve(self, node: dict, base_uri: str) -> tuple[dict, str, str | None]:
+        """Follow $refs; return the node, its base URI and its document's file name."""
+        filename = None
+        while "$ref" in node:
+            uri = urljoin(base_uri, node["$ref"])
+            base_uri, fragment = urldefrag(uri)
+            filename = base_uri.rsplit("/", 1)[-1]
+            node = self.schema.documents[base_uri]
+            for part in fragment.lstrip("/").split("/") if fragment else []:
+                node = node[part]
+        return node, base_uri, filename
+
+    def _is_enum(self, node: dict, base_uri: str) -> bool:
+        return "enum" in self._resolve(node, base_uri)[0]
+
+    def _array_fragments(
+        self, key: str, node: dict, base_uri: str, filename: str | None, pool_rnd: random.Random
+    ) -> FragmentMaker:
+        """Return a maker of arrays drawn from a pool of pre-rendered items."""
+        item_generator = self.compile(node["items"], base_uri)
+        low, high, unique = self._array_bounds(node, filename)
+        pool = [_ENCODER.encode(item_generator(pool_rnd)) for _ in range(self.pool_size)]
+        if unique:
+            # Generated objects list their properties in schema order, so equal
+            # text means equal items, and the deduplicated pool has none.
+            pool = list(dict.fromkeys(pool))
+            high = min(high, len(pool))
+        span = high - low + 1
+        size = len(pool)
+        # An array is a slice of one of several shuffled orders of the pool
+        # (repeated to wrap around), so its items are distinct unless the pool
+        # is smaller than the array, and there are size * ARRAY_ORDERS * span
+        # different arrays.
+        orders = []
+        for _ in range(ARRAY_ORDERS):
+            order = pool[:]
+            pool_rnd.shuffle(order)
+            orders.append((order * (high // size + 2))[: size + high])
+        prefix = key + "["
+
+        def make(rnd: random.Random, number: int) -> str:
+            random_ = rnd.random
+            order = orders[int(random_() * ARRAY_ORDERS)]
+            start = int(random_() * size)
+            return prefix + ", ".join(order[start : start + low + int(random_() * span)]) + "]"
+
+        return make
+
+    @staticmethod
+    def _instance_uri(key: str, template: str) -> FragmentMaker:
+        prefix, suffix = (key + _ENCODER.encode(template)).split("{number}")
+        return lambda rnd, number: prefix + str(number) + suffix
+
+    def _instance_text(self, key: str, multilingual: bool) -> FragmentMaker:
+        """Return a maker of texts joined from two pooled texts (nearly always distinct)."""
+        texts = self._texts
+        size = len(texts)
+
+        def text(rnd: random.Random) -> str:
+            return texts[int(rnd.random() * size)] + " " + texts[int(rnd.random() * size)]
+
+        if multilingual:
+            return lambda rnd, number: key + _ENCODER.encode(self._multilingual_text(rnd, text))
+        return lambda rnd, number: key + _ENCODER.encode(text(rnd))
+
+    def render(self, rnd: random.Random, number: int) -> str:
+        """Return instance number `number` as JSON text, assembled from the fragment pools."""
+        random_ = rnd.random
+        return "{" + ", ".join(
+            [
+                pool[int(random_() * size)] if pool is not None else maker(rnd, number)  # type: ignore[misc]
+                for pool, size, maker, ratio in self._fragments
+                if ratio >= 1.0 or random_() < ratio
+            ]
+        ) + "}"
+
+    def compile_uri(self, uri: str) -> Generator:
+        """Return the generator for a schema document."""
+        if uri not in self._compiled:
+            filename = uri.rsplit("/", 1)[-1]
+            if filename in self._special:
+                generator = self._special[filename]
+            else:
+                # Forwarding stub so that recursive references terminate.
+                target: list[Generator] = []
+                self._compiled[uri] = lambda rnd: target[0](rnd)
+                document_uri, _ = urldefrag(uri)
+                generator = self.compile(self.schema.documents[document_uri], document_uri, filename)
+                target.append(generator)
+            self._compiled[uri] = generator
+        return self._compiled[uri]
+
+    def compile(self, node: object, base_uri: str, filename: str | None = None) -> Generator:
+        """Compile a schema node; filename is set for the root node of a document."""
+        if not isinstance(node, dict):
+            return lambda rnd: None
+        if "$ref" in node:
+            return self.compile_uri(urljoin(base_uri, node["$ref"]))
+        if "const" in node:
+            return lambda rnd, value=node["const"]: value
+        if "enum" in node:
+            values = node["enum"]
+            return lambda rnd: values[int(rnd.random() * len(values))]
+        for keyword in ("oneOf", "anyOf"):
+            if keyword in node:
+                branches = [self.compile(branch, base_uri) for branch in node[keyword]]
+                return lambda rnd: branches[int(rnd.random() * len(branches))](rnd)
+        if "allOf" in node:
+            return self.compile(node["allOf"][0], base_uri)
+
+        node_type = node.get("type")
+        if isinstance(node_type, list):
+            node_type = node_type[0]
+        if node_type == "object" or "properties" in node:
+            return self._object(node, base_uri)
+        if node_type == "array" or "items" in node:
+            return self._array(node, base_uri, filename)
+        if node_type in ("integer", "number"):
+            return lambda rnd: int(rnd.random() * 101)
+        if node_type == "boolean":
+            return lambda rnd: rnd.random() < 0.5
+        if node_type == "null":
+            return lambda rnd: None
+        return self._string(node)
+
+    def _object(self, node: dict, base_uri: str) -> Generator:
+        required = set(node.get("required", []))
+        properties = [
+            (name, self.compile(subschema, base_uri), name in required)
+            for name, subschema in node.get("properties", {}).items()
+        ]
+        optional_ratio = self.optional_ratio
+
+        def generate(rnd: random.Random) -> dict[str, object]:
+            return {
+                name: generator(rnd)
+                for name, generator, is_required in properties
+                if is_required or rnd.random() < optional_ratio
+            }
+
+        return generate
+
+    def _array_bounds(self, node: dict, filename: str | None) -> tuple[int, int, bool]:
+        """Return the item count range of an array and whether its items are unique."""
+        items = node.get("items", {})
+        low = node.get("minItems", 0)
+        high = node.get("maxItems", low + MAX_REPEAT_EXTRA)
+        if filename in self.array_lengths:
+            low, high = self.array_lengths[filename]
+        unique = node.get("uniqueItems", False)
+        if isinstance(items, dict) and isinstance(items.get("enum"), list):
+            # Distinct enum values can run out; repeated values are fine unless unique.
+            unique = True
+            high = min(high, len(items["enum"]))
+        return low, high, unique
+
+    def _array(self, node: dict, base_uri: str, filename: str | None) -> Generator:
+        item_generator = self.compile(node.get("items", {}), base_uri)
+        low, high, unique = self._array_bounds(node, filename)
+        span = high - low + 1
+        if not unique:
+            return lambda rnd: [item_generator(rnd) for _ in range(low + int(rnd.random() * span))]
+
+        def generate(rnd: random.Random) -> list[object]:
+            count = low + int(rnd.random() * span)
+            if count <= 1:
+                return [item_generator(rnd) for _ in range(count)]
+            result: list[object] = []
+            seen: set[str] = set()
+            for _ in range(count * UNIQUE_ATTEMPTS):
+                if len(result) == count:
+                    break
+                item = item_generator(rnd)
+                # Generated objects always list their properties in schema
+                # order, so repr() identifies JSON-equal items.
+                key = repr(item)
+                if key not in seen:
+                    seen.add(key)
+                    result.append(item)
+            return result
+
+        return generate
+
+    def _string(self, node: dict) -> Generator:
+        format_name = node.get("format")
+        pattern = node.get("pattern")
+        min_length = node.get("minLength", 1)
+        pattern_generator = compile_pattern(pattern) if pattern else None
+
+        if format_name == "uri":
+            words = [word.lower() for word in WORDS]
+
+            def base(rnd: random.Random) -> str:
+                return f"https://example.org/{words[int(rnd.random() * len(words))]}/{int(rnd.random() * 1_000_000)}"
+        elif format_name == "date":
+            base = self._pick(DATES)
+        elif format_name == "duration":
+            base = self._pick(DURATIONS)
+        elif pattern_generator is not None:
+            return pattern_generator
+        else:
+            texts = [text.ljust(min_length, ".") for text in self._texts]
+            base = self._pick(texts)
+
+        if pattern_generator is None:
+            return base
+        # Pattern and format (e.g. an ORCID URI): prefer the realistic format
+        # value if it happens to match, otherwise generate from the pattern.
+        compiled = re.compile(pattern)
+        check = FORMAT_CHECKERS.get(format_name or "", lambda value: True)
+
+        def generate(rnd: random.Random) -> str:
+            value = base(rnd)
+            if compiled.search(value):
+                return value
+            for _ in range(UNIQUE_ATTEMPTS):
+                value = pattern_generator(rnd)
+                if check(value):
+                    break
+            return value
+
+        return generate
+
+    @staticmethod
+    def _pick(values: list) -> Generator:
+        """Return a generator picking one of the values uniformly."""
+        return lambda rnd: values[int(rnd.random() * len(values))]
+
+    def _language(self, rnd: random.Random) -> str:
+        return self.languages[bisect.bisect(self._language_bounds, rnd.random())]
+
+    def _pooled_text(self, rnd: random.Random) -> str:
+        return self._texts[int(rnd.random() * len(self._texts))]
+
+    def _multilingual_text(self, rnd: random.Random, text: Callable[[random.Random], str] | None = None) -> object:
+        text = text or self._pooled_text
+        if rnd.random() >= self.multilingual_ratio:
+            return text(rnd)
+        count = 1 + int(rnd.random() * len(self.languages))
+        values: dict[str, str] = {}
+        while len(values) < count:
+            values.setdefault(self._language(rnd), text(rnd))
+        return values
+
+
+# ─── Worker processes ─────────────────────────────────────
+
+_generator: InstanceGenerator | None = None
+_schema: SchemaVersion | None = None
+_settings: dict[str, object] = {}
+
+
+def _init_worker(settings: dict[str, object]) -> None:
+    global _generator, _schema, _settings
+    _settings = settings
+    _schema = SchemaRegistry().get(settings["schema_version"])  # type: ignore[arg-type]
+    _generator = InstanceGenerator(
+        _schema,
+        settings["array_lengths"],  # type: ignore[arg-type]
+        *parse_languages(settings["languages"]),  # type: ignore[arg-type]
+        settings["multilingual_ratio"],  # type: ignore[arg-type]
+        settings["optional_ratio"],  # type: ignore[arg-type]
+        settings["seed"],  # type: ignore[arg-type]
+        settings["pool_size"],  # type: ignore[arg-type]
+    )
+
+
+def render_chunk(chunk: int) -> list[str]:
+    """Render the instances of one chunk as JSON text (deterministic for seed and chunk)."""
+    assert _generator is not None and _schema is not None
+    rnd = random.Random(f"{_settings['seed']}:{chunk}")
+    start = chunk * CHUNK_SIZE
+    count = min(CHUNK_SIZE, _settings["count"] - start)  # type: ignore[operator]
+    render = _generator.render
+    texts = [render(rnd, start + offset) for offset in range(count)]
+    if _settings["validate"]:
+        for offset, text in enumerate(texts):
+            errors = _schema.validate(json.loads(text))
+            if errors:
+                raise ValueError(f"Generated instance {start + offset} is invalid: {errors}")
+    return texts
+
+
+def generate_chunk(chunk: int) -> list[dict[str, object]]:
+    """Generate the instances of one chunk as parsed JSON values."""
+    return [json.loads(text) for text in render_chunk(chunk)]
+
+
+def serialize_chunk(chunk: int) -> str:
+    """Generate a chunk and serialize it as NDJSON."""
+    return "\n".join(render_chunk(chunk)) + "\n"
+
+
+def write_yaml_chunk(chunk: int) -> int:
+    """Generate a chunk and write each instance as a YAML file."""
+    import yaml
+
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    output = Path(_settings["output"])  # type: ignore[arg-type]
+    instances = generate_chunk(chunk)
+    for offset, instance in enumerate(instances):
+        with (output / f"metadata-{chunk * CHUNK_SIZE + offset:08d}.yml").open("w", encoding="utf-8") as f:
+            yaml.dump(instance, f, Dumper=dumper, allow_unicode=True, sort_keys=False)
+    return len(instances)
+
+
+def main() -> int:
+    """Generate synthetic metadata instances."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--output", default="-")
+    parser.add_argument("--format", choices=["ndjson", "yaml"], default="ndjson")
+    parser.add_argument("--seed", default="0")
+    parser.add_argument("--schema-version")
+    parser.add_argument("--chapters", type=parse_range, default=(1, 6))
+    parser.add_argument("--keywords", type=parse_range, default=(1, 8))
+    parser.add_argument("--languages", default="de:3,en:1")
+    parser.add_argument("--multilingual-ratio", type=float, default=0.3)
+    parser.add_argument("--optional-ratio", type=float, default=0.5)
+    parser.add_argument("--pool-size", type=int)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--validate", action="store_true")
+    args = parser.parse_args()
+
+    if args.chapters[0] < 1 or args.keywords[0] < 1:
+        print("Error: chapters and keywords need at least 1 item (minItems)", file=sys.stderr)
+        return 1
+    for name, (low, high) in (("chapters", args.chapters), ("keywords", args.keywords)):
+        if low > high:
+            print(f"Error: --{name} {low}-{high}: minimum is larger than maximum", file=sys.stderr)
+            return 1
+    try:
+        parse_languages(args.languages)
+    except ValueError as e:
+        print(f"Error: --languages: {e}", file=sys.stderr)
+        return 1
+    if args.pool_size is not None and args.pool_size < 1:
+        print("Error: --pool-size must be positive", file=sys.stderr)
+        return 1
+    if args.format == "yaml" and args.output == "-":
+        print("Error: --format yaml needs an output directory", file=sys.stderr)
+        return 1
+
+    registry = SchemaRegistry()
+    settings = {
+        "count": args.count,
+        "seed": args.seed,
+        "schema_version": args.schema_version or registry.latest(),
+        "array_lengths": {"chapters.json": args.chapters, "keywords.json": args.keywords},
+        "languages": args.languages,
+        "multilingual_ratio": args.multilingual_ratio,
+        "optional_ratio": args.optional_ratio,
+        "pool_size": args.pool_size or min(max(args.count // 20, MIN_POOL_SIZE), MAX_POOL_SIZE),
+        "validate": args.validate,
+        "output": args.output,
+    }
+    chunks = range((args.count + CHUNK_SIZE - 1) // CHUNK_SIZE)
+
+    if args.format == "yaml":
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+        work = write_yaml_chunk
+    else:
+        work = serialize_chunk  # type: ignore[assignment]
+    if args.format == "yaml" or args.output == "-":
+        out = sys.stdout
+    else:
+        out = open(args.output, "w", encoding="utf-8")
+
+    try:
+        if args.workers > 1:
+            pool = Pool(args.workers, initializer=_init_worker, initargs=(settings,))
+            results = pool.imap(work, chunks)
+        else:
+            pool = None
+            _init_worker(settings)
+            results = map(work, chunks)
+        try:
+            for result in results:
+                if isinstance(result, str):
+                    out.write(result)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Generated {args.count} instance(s) (schema-version {settings['schema_version']})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Offline resolution of QUADRIGA schema $ids for third-party validators.
+
+Every schema file declares an $id such as
+https://quadriga-dk.github.io/quadriga-schema/v1.0.0/chapter.json. Validators
+resolving $refs may fetch these URLs over the network, which is slow and fails
+in air-gapped environments. The id registry maps every $id of all version
+directories, plus the `latest/` alias URLs, to a local file:
+
+    id-registry/
+      index.json          {"latest": "1.0.0", "documents": {$id: "v1.0.0/chapter.json", ...}}
+      v1.0.0/chapter.json
+      ...
+
+The registry is built by build-id-registry.py. IdRegistry reads only the index
+up front and parses each document on first access, so a validator resolving a
+handful of $refs only reads the documents it needs. Usage with jsonschema
+(4.18+), without any HTTP requests:
+
+    from id_registry import IdRegistry
+
+    ids = IdRegistry("_build/id-registry")
+    validator = jsonschema.Draft202012Validator(
+        ids.resolve(ids.root_id()), registry=ids.referencing_registry()
+    )
+
+Older validators taking a URI -> document store can use `ids.store()`.
+"""
+
+import json
+import threading
+from pathlib import Path
+from urllib.parse import urldefrag
+
+from schema_registry import ROOT, ROOT_SCHEMA, discover_versions
+
+INDEX_FILE = "index.json"
+LATEST_ALIAS = "latest"
+
+
+def build_index(root: Path = ROOT) -> dict[str, object]:
+    """Map the $id of every schema file (and its latest alias) to its relative path."""
+    versions = discover_versions(root)
+    documents: dict[str, str] = {}
+    for version, directory in versions.items():
+        for filepath in sorted(directory.glob("*.json")):
+            with filepath.open(encoding="utf-8") as f:
+                schema_id = json.load(f).get("$id")
+            if isinstance(schema_id, str):
+                documents[urldefrag(schema_id).url] = f"{directory.name}/{filepath.name}"
+
+    latest_link = root / LATEST_ALIAS
+    latest = latest_link.resolve().name[1:] if latest_link.exists() else None
+    if latest not in versions:
+        latest = next(reversed(versions), None)
+    if latest is not None:
+        prefix = f"v{latest}/"
+        for schema_id, relpath in list(documents.items()):
+            if relpath.startswith(prefix):
+                base, _, filename = schema_id.rpartition("/")
+                alias = f"{base.rpartition('/')[0]}/{LATEST_ALIAS}/{filename}"
+                documents.setdefault(alias, relpath)
+
+    return {"latest": latest, "documents": dict(sorted(documents.items()))}
+
+
+class IdRegistry:
+    """Resolve schema $ids to parsed documents from a local id registry."""
+
+    def __init__(self, path: str | Path, index: dict[str, object] | None = None):
+        """Open an id registry directory (or a repository checkout with `index`)."""
+        self.path = Path(path)
+        if index is None:
+            with (self.path / INDEX_FILE).open(encoding="utf-8") as f:
+                index = json.load(f)
+        self.latest: str | None = index.get("latest")  # type: ignore[assignment]
+        self._paths: dict[str, str] = index["documents"]  # type: ignore[assignment]
+        self._documents: dict[str, dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, root: Path = ROOT) -> "IdRegistry":
+        """Create a registry directly on the version directories of a checkout."""
+        return cls(root, build_index(root))
+
+    def __contains__(self, uri: str) -> bool:
+        """Return whether a URI (fragments are ignored) is known to the registry."""
+        return urldefrag(uri).url in self._paths
+
+    def __len__(self) -> int:
+        """Return the number of known $ids, including latest aliases."""
+        return len(self._paths)
+
+    def ids(self) -> list[str]:
+        """Return all known $ids."""
+        return list(self._paths)
+
+    def root_id(self, version: str | None = None) -> str:
+        """Return the $id of the root schema of a version (default: latest)."""
+        version = version or self.latest
+        for schema_id, relpath in self._paths.items():
+            if relpath == f"v{version}/{ROOT_SCHEMA}" and f"/v{version}/" in schema_id:
+                return schema_id
+        raise KeyError(f"No {ROOT_SCHEMA} for version {version}")
+
+    def resolve(self, uri: str) -> dict[str, object]:
+        """Return the parsed document for a URI, reading it on first access.
+
+        Raises KeyError for URIs that are not in the registry.
+        """
+        relpath = self._paths[urldefrag(uri).url]
+        document = self._documents.get(relpath)
+        if document is None:
+            with (self.path / relpath).open(encoding="utf-8") as f:
+                document = json.load(f)
+            with self._lock:
+                document = self._documents.setdefault(relpath, document)
+        return document
+
+    def store(self) -> dict[str, dict[str, object]]:
+        """Return a URI -> document mapping of all documents (reads all of them)."""
+        return {uri: self.resolve(uri) for uri in self._paths}
+
+    def retrieve(self, uri: str) -> object:
+        """Return a referencing.Resource for a URI (retrieve hook of referencing.Registry)."""
+        from referencing import Resource
+        from referencing.exceptions import NoSuchResource
+        from referencing.jsonschema import DRAFT202012
+
+        try:
+            document = self.resolve(uri)
+        except KeyError:
+            raise NoSuchResource(ref=uri) from None
+        return Resource.from_contents(document, default_specification=DRAFT202012)
+
+    def referencing_registry(self) -> object:
+        """Return a referencing.Registry that resolves all $ids from this registry."""
+        from referencing import Registry
+
+        return Registry(retrieve=self.retrieve)  # type: ignore[call-arg]
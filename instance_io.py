@@ -0,0 +1,137 @@
+"""
+Read QUADRIGA metadata instances from YAML, JSON and NDJSON files.
+
+Instance files are usually single YAML documents (metadata.yml); larger
+corpora are stored as NDJSON files with one instance per line. The functions
+here stream the instances one at a time so tools can process corpora of any
+size with bounded memory. Reading YAML requires PyYAML (see requirements.txt);
+JSON and NDJSON only need the standard library.
+
+Fields inside an instance are addressed by paths of property names separated
+by '.' and '[]' for array items, e.g. 'chapters[].learning-objectives[].title';
+split_path and values_at resolve them.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+YAML_SUFFIXES = {".yml", ".yaml"}
+JSON_SUFFIXES = {".json"}
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+INSTANCE_SUFFIXES = YAML_SUFFIXES | JSON_SUFFIXES | NDJSON_SUFFIXES
+
+
+def find_instance_files(paths: Iterable[str | Path]) -> list[Path]:
+    """Expand files and directories (searched recursively) into instance files."""
+    files: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                sorted(f for f in path.rglob("*") if f.suffix in INSTANCE_SUFFIXES and f.is_file())
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def _yaml_loader() -> type:
+    """Return the fastest available PyYAML loader."""
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _yaml_to_json(value: object) -> object:
+    """Convert YAML-only scalar types (dates) to the strings JSON would hold."""
+    if isinstance(value, dict):
+        return {str(key): _yaml_to_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_yaml_to_json(item) for item in value]
+    if hasattr(value, "isoformat"):
+        return value.isoformat()  # type: ignore[union-attr]
+    return value
+
+
+def parse_instances(data: bytes, suffix: str) -> Iterator[object]:
+    """Parse the instances contained in the raw content of an instance file.
+
+    Raises ValueError for content that is not valid JSON or YAML.
+    """
+    if suffix in NDJSON_SUFFIXES:
+        for line in data.splitlines():
+            if line.strip():
+                yield json.loads(line)
+    elif suffix in YAML_SUFFIXES:
+        import yaml
+
+        try:
+            documents = list(yaml.load_all(data, Loader=_yaml_loader()))
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML: {e}") from e
+        for document in documents:
+            if document is not None:
+                yield _yaml_to_json(document)
+    else:
+        yield json.loads(data)
+
+
+def iter_instances(filepath: Path) -> Iterator[tuple[int, object]]:
+    """Yield (index, instance) for every instance in a file.
+
+    NDJSON files are read line by line; the index is the position of the
+    instance within its file (always 0 for single-document files).
+    """
+    if filepath.suffix in NDJSON_SUFFIXES:
+        with filepath.open("rb") as f:
+            index = 0
+            for line in f:
+                if line.strip():
+                    yield index, json.loads(line)
+                    index += 1
+        return
+    yield from enumerate(parse_instances(filepath.read_bytes(), filepath.suffix))
+
+
+def split_ndjson(filepath: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split an NDJSON file into byte ranges of about chunk_bytes for parallel reading."""
+    size = filepath.stat().st_size
+    return [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)] or [(0, 0)]
+
+
+def iter_ndjson_lines(filepath: Path, start: int, end: int) -> Iterator[bytes]:
+    """Yield the raw, non-empty NDJSON lines that start within [start, end)."""
+    with filepath.open("rb") as f:
+        if start > 0:
+            # Skip the line that started in the previous range.
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                yield line
+
+
+def split_path(path: str) -> list[str]:
+    """Split 'chapters[].title' into ['chapters', '[]', 'title']."""
+    tokens: list[str] = []
+    for part in path.split(".") if path else []:
+        name = part.rstrip("[]")
+        if name:
+            tokens.append(name)
+        tokens.extend(["[]"] * ((len(part) - len(name)) // 2))
+    return tokens
+
+
+def values_at(value: object, tokens: list[str]) -> list[Any]:
+    """Return all values of an instance at a path split by split_path."""
+    values = [value]
+    for token in tokens:
+        if token == "[]":
+            values = [item for value in values if isinstance(value, list) for item in value]
+        else:
+            values = [value[token] for value in values if isinstance(value, dict) and token in value]
+    return values
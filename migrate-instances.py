@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Migrate QUADRIGA metadata instances to another schema version.
+
+Every instance is upgraded from the schema-version it declares by the
+migrations declared in migrations.py, composed into a single pass, and the
+result is validated against the target version. Instance files are processed
+by a pool of worker processes; large NDJSON files are split into byte ranges.
+
+A file is written only if all of its instances migrated to valid instances.
+Each file is first written to a temporary file in the target directory and
+then renamed, so an interrupted run never leaves a partially written file.
+Instances that do not change keep their original formatting; YAML files with
+changed instances are written anew, without comments.
+
+Requirements:
+  - Python 3.10+
+  - PyYAML for YAML instance files (see requirements.txt)
+
+Usage:
+  python3 migrate-instances.py [--to VERSION] (--output DIR | --in-place | --dry-run)
+                               [--workers N] <file-or-directory> [...]
+
+  --to VERSION   target schema version (default: latest)
+  --output DIR   write the migrated files below DIR, keeping the directory layout
+                 of directories (files given directly are written to DIR); the
+                 run is refused if two files would be written to the same path
+  --in-place     replace the instance files
+  --dry-run      only report which fields would change
+
+Exit codes:
+  0 - All instances migrated (or would migrate) to valid instances
+  1 - Migration or validation errors found, or script error
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any
+
+from instance_io import (
+    NDJSON_SUFFIXES,
+    YAML_SUFFIXES,
+    find_instance_files,
+    iter_ndjson_lines,
+    parse_instances,
+    split_ndjson,
+)
+from migrations import Migrator, NoMigrationPathError, changed_fields, copy_value
+from schema_registry import SchemaRegistry, SchemaVersion
+
+NDJSON_CHUNK_BYTES = 8 * 1024 * 1024
+MAX_ERRORS_PER_FILE = 10
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, check_circular=False)
+
+
+class ChunkResult:
+    """The migrated content of one file or NDJSON byte range."""
+
+    def __init__(self) -> None:
+        self.data = b""
+        self.instances = 0
+        self.changed = 0
+        self.errors: list[str] = []
+        self.fields: Counter[tuple[str, str]] = Counter()
+
+
+# A task is (index of the file, path, start, end); start/end are a byte range
+# for NDJSON files and (0, -1) for whole files.
+Task = tuple[int, str, int, int]
+
+_migrator: Migrator | None = None
+_target: SchemaVersion | None = None
+_dry_run = False
+
+
+def _init_worker(target: str, dry_run: bool) -> None:
+    global _migrator, _target, _dry_run
+    _migrator = Migrator(target)
+    _target = SchemaRegistry().get(target)
+    _dry_run = dry_run
+
+
+def _migrate(instance: object, result: ChunkResult) -> tuple[bool, list[str]]:
+    """Migrate and validate one instance; return whether it changed and its errors."""
+    assert _migrator is not None and _target is not None
+    result.instances += 1
+    before = instance.get("schema-version") if isinstance(instance, dict) else None
+    original = copy_value(instance) if _dry_run else None
+    try:
+        migrated = _migrator.migrate(instance)
+    except NoMigrationPathError as e:
+        return False, [e.args[0]]
+    except ValueError as e:
+        return False, [str(e)]
+    if original is not None:
+        fields = set(changed_fields(original, migrated))
+        result.fields.update(fields)
+        changed = bool(fields)
+    else:
+        changed = before != _migrator.target
+    result.changed += changed
+    return changed, _target.validate(migrated)
+
+
+def process_task(task: Task) -> tuple[int, ChunkResult]:
+    """Migrate the instances of one file or NDJSON byte range."""
+    file_index, filename, start, end = task
+    filepath = Path(filename)
+    result = ChunkResult()
+    try:
+        if end >= 0:
+            lines: list[bytes] = []
+            for number, line in enumerate(iter_ndjson_lines(filepath, start, end), 1):
+                instance = json.loads(line)
+                changed, errors = _migrate(instance, result)
+                if errors:
+                    label = f"line {number} after byte {start}" if start else f"line {number}"
+                    result.errors.extend(f"{label}: {error}" for error in errors)
+                if changed and not _dry_run:
+                    line = _ENCODER.encode(instance).encode("utf-8") + b"\n"
+                lines.append(line if line.endswith(b"\n") else line + b"\n")
+            result.data = b"".join(lines)
+        else:
+            data = filepath.read_bytes()
+            instances = list(parse_instances(data, filepath.suffix))
+            any_changed = False
+            for index, instance in enumerate(instances):
+                changed, errors = _migrate(instance, result)
+                any_changed |= changed
+                label = f"document {index + 1}: " if len(instances) > 1 else ""
+                result.errors.extend(label + error for error in errors)
+            result.data = serialize(instances, filepath.suffix) if any_changed and not _dry_run else data
+    except (OSError, ValueError) as e:
+        result.errors.append(str(e))
+    if _dry_run:
+        result.data = b""
+    del result.errors[MAX_ERRORS_PER_FILE:]
+    return file_index, result
+
+
+def serialize(instances: list[Any], suffix: str) -> bytes:
+    """Serialize the instances of a YAML or JSON instance file."""
+    if suffix in YAML_SUFFIXES:
+        import yaml
+
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        text = yaml.dump_all(instances, Dumper=dumper, allow_unicode=True, sort_keys=False, width=100)
+        return text.encode("utf-8")
+    return (json.dumps(instances[0], indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def make_tasks(files: list[Path]) -> list[Task]:
+    """Create one task per file and split large NDJSON files into byte ranges."""
+    tasks: list[Task] = []
+    for file_index, filepath in enumerate(files):
+        if filepath.suffix in NDJSON_SUFFIXES and filepath.exists():
+            ranges = split_ndjson(filepath, NDJSON_CHUNK_BYTES)
+            tasks.extend((file_index, str(filepath), start, end) for start, end in ranges)
+        else:
+            tasks.append((file_index, str(filepath), 0, -1))
+    return tasks
+
+
+def output_paths(paths: list[str], output: Path | None) -> tuple[list[Path], list[Path]]:
+    """Return the instance files and the file each is written to."""
+    files: list[Path] = []
+    targets: list[Path] = []
+    for path in map(Path, paths):
+        found = find_instance_files([path])
+        files.extend(found)
+        for filepath in found:
+            if output is None:
+                targets.append(filepath)
+            else:
+                relpath = filepath.relative_to(path) if path.is_dir() else Path(filepath.name)
+                targets.append(output / relpath)
+    return files, targets
+
+
+class AtomicWriter:
+    """Write a file through a temporary file that replaces the target when complete."""
+
+    def __init__(self, target: Path, source: Path):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        self.target = target
+        self.source = source
+        fd, name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        self.tmp = Path(name)
+        self.file = os.fdopen(fd, "wb")
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+
+    def commit(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        shutil.copymode(self.source, self.tmp)
+        os.replace(self.tmp, self.target)
+
+    def abort(self) -> None:
+        self.file.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def main() -> int:
+    """Migrate QUADRIGA metadata instances."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="+", help="instance files or directories")
+    parser.add_argument("--to", dest="target", help="target schema version (default: latest)")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--output", type=Path, help="directory to write the migrated files to")
+    mode.add_argument("--in-place", action="store_true", help="replace the instance files")
+    mode.add_argument("--dry-run", action="store_true", help="only report which fields would change")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    registry = SchemaRegistry()
+    target = args.target or registry.latest()
+    if target not in registry.versions():
+        print(f"Unknown schema version '{target}', available: {registry.versions()}", file=sys.stderr)
+        return 1
+
+    files, targets = output_paths(args.paths, args.output)
+    if not files:
+        print("No instance files found", file=sys.stderr)
+        return 1
+    if not args.dry_run:
+        # Files with the same name given from different directories would be
+        # written to the same output file, the last one silently winning.
+        duplicates = sorted({str(t) for t, count in Counter(targets).items() if count > 1})
+        if duplicates:
+            for duplicate in duplicates:
+                sources = ", ".join(str(f) for f, t in zip(files, targets) if str(t) == duplicate)
+                print(f"Error: {duplicate} would be written from more than one file: {sources}", file=sys.stderr)
+            return 1
+    tasks = make_tasks(files)
+    remaining = Counter(file_index for file_index, _, _, _ in tasks)
+    print(f"Migrating {len(files)} file(s) to schema-version {target} with {args.workers} worker(s)...")
+
+    instances = changed = changed_files = written = failed = 0
+    fields: Counter[tuple[str, str]] = Counter()
+    writers: dict[int, AtomicWriter] = {}
+    file_errors: dict[int, list[str]] = {}
+    file_changes: Counter[int] = Counter()
+
+    pool = Pool(args.workers, initializer=_init_worker, initargs=(target, args.dry_run)) if args.workers > 1 else None
+    if pool is None:
+        _init_worker(target, args.dry_run)
+    try:
+        results = pool.imap(process_task, tasks) if pool else map(process_task, tasks)
+        for file_index, result in results:
+            instances += result.instances
+            changed += result.changed
+            file_changes[file_index] += result.changed
+            fields.update(result.fields)
+            errors = file_errors.setdefault(file_index, [])
+            errors.extend(result.errors[: max(MAX_ERRORS_PER_FILE - len(errors), 0)])
+
+            if not args.dry_run and not file_errors[file_index]:
+                if file_index not in writers:
+                    writers[file_index] = AtomicWriter(targets[file_index], files[file_index])
+                writers[file_index].write(result.data)
+
+            remaining[file_index] -= 1
+            if remaining[file_index]:
+                continue
+            writer = writers.pop(file_index, None)
+            file_changed = file_changes.pop(file_index) > 0
+            changed_files += file_changed
+            if file_errors[file_index]:
+                failed += 1
+                if writer:
+                    writer.abort()
+                print(f"❌ {files[file_index]}:")
+                for error in file_errors[file_index]:
+                    print(f"    {error}")
+                print()
+            elif writer and args.in_place and not file_changed:
+                # Leave unchanged files untouched.
+                writer.abort()
+            elif writer:
+                writer.commit()
+                written += 1
+            del file_errors[file_index]
+    finally:
+        for writer in writers.values():
+            writer.abort()
+        if pool:
+            pool.terminate()
+
+    if args.dry_run and fields:
+        print("Field changes (kind, path, instances):")
+        for (kind, path), count in sorted(fields.items(), key=lambda item: (item[0][1], item[0][0])):
+            print(f"  {kind} {path or '(root)'}: {count}")
+        print()
+
+    print("=" * 60)
+    print("Dry run complete:" if args.dry_run else "Migration complete:")
+    print(f"  Files: {len(files)} ({changed_files} {'would change' if args.dry_run else 'changed'}, {failed} failed)")
+    if not args.dry_run:
+        print(f"  Files written: {written}")
+    print(f"  Instances: {instances} ({changed} {'would change' if args.dry_run else 'changed'})")
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Upgrade QUADRIGA metadata instances between schema versions.
+
+A schema release that changes the instance format declares a Migration from
+its predecessor: a list of steps such as renaming a field, adding a newly
+required field, mapping changed enum values or removing a field. The steps
+of all migrations between two versions are composed into a single function
+that upgrades an instance in one pass and sets its schema-version:
+
+    MIGRATIONS = [
+        Migration("1.0.0", "1.1.0", [
+            rename("chapters[].learning-goals", "learning-objectives"),
+            set_default("context-of-creation", "Created as part of QUADRIGA."),
+            map_values("chapters[].learning-objectives[].blooms-category",
+                       {"Remember": "remember", "Understand": "understand"}),
+            remove("supplemented-by"),
+        ]),
+    ]
+
+Paths use property names separated by '.' and '[]' for array items, e.g.
+'chapters[].learning-objectives[].competency'; a step applies to every match.
+Any callable taking the instance and changing it in place can be used as a
+step for changes the helpers do not cover.
+
+migrate-instances.py applies the migrations to instance files.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from instance_io import split_path, values_at
+
+# A step changes an instance in place.
+Step = Callable[[dict[str, Any]], None]
+
+
+class NoMigrationPathError(KeyError):
+    """No chain of declared migrations leads from one version to another."""
+
+
+class Migration:
+    """The steps upgrading instances from one schema version to the next."""
+
+    def __init__(self, from_version: str, to_version: str, steps: list[Step], description: str = ""):
+        """Declare a migration from from_version to to_version."""
+        self.from_version = from_version
+        self.to_version = to_version
+        self.steps = steps
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"Migration({self.from_version!r} -> {self.to_version!r}, {len(self.steps)} step(s))"
+
+
+# All declared migrations. v1.0.0 is the first schema version, so there is
+# nothing to migrate yet.
+MIGRATIONS: list[Migration] = []
+
+
+# ─── Paths ────────────────────────────────────────────────
+
+
+def _parent_and_key(path: str) -> tuple[list[str], str]:
+    tokens = split_path(path)
+    if not tokens or tokens[-1] == "[]":
+        raise ValueError(f"Path must end with a property name: '{path}'")
+    return tokens[:-1], tokens[-1]
+
+
+# ─── Steps ────────────────────────────────────────────────
+
+
+def rename(path: str, new_name: str) -> Step:
+    """Rename a property, keeping its position among the other properties.
+
+    Raises ValueError if an object has both properties, since one of the
+    values would be lost; such instances have to be fixed by hand (or by a
+    step before the rename that merges or removes one of them).
+    """
+    parent_tokens, key = _parent_and_key(path)
+
+    def step(instance: dict[str, Any]) -> None:
+        for parent in values_at(instance, parent_tokens):
+            if isinstance(parent, dict) and key in parent:
+                if new_name in parent and new_name != key:
+                    raise ValueError(f"Cannot rename '{path}' to '{new_name}': the property already exists")
+                items = [(new_name if name == key else name, value) for name, value in parent.items()]
+                parent.clear()
+                parent.update(items)
+
+    return step
+
+
+def set_default(path: str, value: object | Callable[[dict[str, Any]], object]) -> Step:
+    """Add a property where it is missing.
+
+    `value` may be a callable receiving the object the property is added to,
+    for values derived from other properties.
+    """
+    parent_tokens, key = _parent_and_key(path)
+
+    def step(instance: dict[str, Any]) -> None:
+        for parent in values_at(instance, parent_tokens):
+            if isinstance(parent, dict) and key not in parent:
+                parent[key] = value(parent) if callable(value) else copy_value(value)
+
+    return step
+
+
+def map_values(path: str, mapping: dict[Any, Any]) -> Step:
+    """Replace values (e.g. renamed enum values); arrays of values are mapped item by item."""
+    parent_tokens, key = _parent_and_key(path)
+
+    def step(instance: dict[str, Any]) -> None:
+        for parent in values_at(instance, parent_tokens):
+            if not isinstance(parent, dict) or key not in parent:
+                continue
+            value = parent[key]
+            if isinstance(value, list):
+                parent[key] = [mapping.get(item, item) if _hashable(item) else item for item in value]
+            elif _hashable(value):
+                parent[key] = mapping.get(value, value)
+
+    return step
+
+
+def remove(path: str) -> Step:
+    """Remove a property."""
+    parent_tokens, key = _parent_and_key(path)
+
+    def step(instance: dict[str, Any]) -> None:
+        for parent in values_at(instance, parent_tokens):
+            if isinstance(parent, dict):
+                parent.pop(key, None)
+
+    return step
+
+
+def _hashable(value: object) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def copy_value(value: Any) -> Any:
+    """Copy a JSON value (much faster than copy.deepcopy)."""
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+# ─── Composition ──────────────────────────────────────────
+
+
+def migration_path(from_version: str, to_version: str, migrations: list[Migration] | None = None) -> list[Migration]:
+    """Return the shortest chain of migrations from one version to another."""
+    migrations = MIGRATIONS if migrations is None else migrations
+    chains: dict[str, list[Migration]] = {from_version: []}
+    queue = [from_version]
+    for version in queue:
+        if version == to_version:
+            return chains[version]
+        for migration in migrations:
+            if migration.from_version == version and migration.to_version not in chains:
+                chains[migration.to_version] = [*chains[version], migration]
+                queue.append(migration.to_version)
+    raise NoMigrationPathError(f"No migration from schema version '{from_version}' to '{to_version}'")
+
+
+def compose(
+    from_version: str, to_version: str, migrations: list[Migration] | None = None
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Compose the steps of all migrations between two versions into one function.
+
+    The function changes the instance in place, sets its schema-version to
+    to_version and returns it.
+    """
+    steps = [step for migration in migration_path(from_version, to_version, migrations) for step in migration.steps]
+
+    def migrate(instance: dict[str, Any]) -> dict[str, Any]:
+        for step in steps:
+            step(instance)
+        instance["schema-version"] = to_version
+        return instance
+
+    return migrate
+
+
+class Migrator:
+    """Upgrade instances of any declared version to one target version."""
+
+    def __init__(self, target: str, migrations: list[Migration] | None = None):
+        """Create a migrator to the target version."""
+        self.target = target
+        self.migrations = MIGRATIONS if migrations is None else migrations
+        self._composed: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {}
+
+    def migrate(self, instance: object) -> dict[str, Any]:
+        """Upgrade an instance in place, dispatching on its schema-version.
+
+        Raises NoMigrationPathError if the instance has no schema-version or
+        no migration leads from its version to the target, and ValueError if
+        a step cannot be applied to it.
+        """
+        version = instance.get("schema-version") if isinstance(instance, dict) else None
+        if not isinstance(version, str):
+            raise NoMigrationPathError("Instance has no 'schema-version' string")
+        migrate = self._composed.get(version)
+        if migrate is None:
+            migrate = self._composed[version] = compose(version, self.target, self.migrations)
+        return migrate(instance)  # type: ignore[arg-type]
+
+
+def changed_fields(old: object, new: object, path: str = "") -> list[tuple[str, str]]:
+    """Return (kind, path) of all differences between two instances.
+
+    kind is '+' (added), '-' (removed) or '~' (changed); array indices are
+    written as '[]' so the paths of all instances can be counted together.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes: list[tuple[str, str]] = []
+        prefix = f"{path}." if path else ""
+        for key, value in old.items():
+            if key not in new:
+                changes.append(("-", prefix + key))
+            elif value != new[key]:
+                changes.extend(changed_fields(value, new[key], prefix + key))
+        changes.extend(("+", prefix + key) for key in new if key not in old)
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        changes = []
+        for item_old, item_new in zip(old, new):
+            if item_old != item_new:
+                changes.extend(changed_fields(item_old, item_new, f"{path}[]"))
+        changes.extend(("-", f"{path}[]") for _ in old[len(new) :])
+        changes.extend(("+", f"{path}[]") for _ in new[len(old) :])
+        return changes
+    return [] if old == new else [("~", path)]
@@ -0,0 +1,732 @@
+#!/usr/bin/env python3
+"""
+Serve QUADRIGA metadata validation and crosswalk lookups over HTTP.
+
+The schemas and x-mappings of all version directories are loaded and compiled
+once at start-up, so callers do not pay interpreter start-up and schema
+parsing for every validation. The server reloads them when a schema file
+changes: the new schemas are compiled in the background and swapped in at
+once, requests in progress finish with the schemas they started with, and no
+request is dropped.
+
+Endpoints:
+  POST /validate              validate an instance (JSON or YAML) or a batch of
+                              instances (JSON array, NDJSON, multi-document
+                              YAML) against the schema-version each declares,
+                              or against ?version=X
+  GET  /validate-x-mappings   x-mappings errors of the loaded schema files
+  POST /validate-x-mappings   validate an x-mappings object, or an array of
+                              them, against ?version=X (default: latest)
+  GET  /crosswalk?target=T    schema elements mapped to a vocabulary term
+                              (prefixed like dc:title or a full URI); filter
+                              with &version=X, &vocabulary=V, &relation=R
+  GET  /health                loaded versions and time of the last reload
+  GET  /metrics               request counts and latency histograms
+                              (Prometheus text format)
+
+Connections are kept alive (HTTP/1.1) and may pipeline requests. At most
+--max-concurrency requests are processed at a time; further requests wait
+(after their body has been received).
+/health and /metrics are always answered immediately: they never wait for a
+slot, and request bodies are parsed (and validation results encoded) in a
+worker thread.
+
+Requirements:
+  - Python 3.10+
+  - PyYAML for YAML request bodies (see requirements.txt)
+
+Usage:
+  python3 schema-server.py [--host HOST] [--port PORT] [options]
+
+Options:
+  --max-concurrency N       requests processed at a time (default: 32)
+  --max-batch N             instances per request (default: 10000)
+  --max-body-bytes N        request body size limit (default: 64 MiB)
+  --keep-alive-timeout S    close idle connections after S seconds, and
+                            connections whose request body takes longer
+                            (default: 15)
+  --reload-interval S       check schema files for changes every S seconds,
+                            0 to disable (default: 2); SIGHUP reloads at once
+
+Exit codes:
+  0 - Server stopped
+  1 - Schemas could not be loaded or script error
+"""
+
+import argparse
+import asyncio
+import bisect
+import contextlib
+import importlib.util
+import json
+import re
+import signal
+import sys
+import time
+from collections import Counter
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from instance_io import parse_instances
+from schema_registry import ROOT, ROOT_SCHEMA, SchemaRegistry, SchemaVersion, UnknownSchemaVersionError, discover_versions
+
+MAX_HEADER_BYTES = 64 * 1024
+HEX_DIGITS = b"0123456789abcdefABCDEF"
+YIELD_EVERY = 64
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+ROUTES = {"/validate", "/validate-x-mappings", "/crosswalk", "/health", "/metrics"}
+
+
+def _load_script(filename: str) -> Any:
+    """Import one of the repository's (hyphenated) scripts as a module."""
+    spec = importlib.util.spec_from_file_location(filename.replace("-", "_")[:-3], ROOT / filename)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+x_mappings = _load_script("validate-x-mappings.py")
+
+
+class HTTPError(Exception):
+    """An error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# ─── Loaded schemas ───────────────────────────────────────
+
+
+def fingerprint(root: Path) -> tuple[tuple[str, int, int], ...]:
+    """Return the name, mtime and size of every schema file (and the latest link)."""
+    entries = []
+    for filepath in sorted(root.glob("v*/*.json")):
+        with contextlib.suppress(OSError):
+            stat = filepath.stat()
+            entries.append((str(filepath), stat.st_mtime_ns, stat.st_size))
+    with contextlib.suppress(OSError):
+        entries.append((str((root / "latest").resolve()), 0, 0))
+    return tuple(entries)
+
+
+def resolve_uri(target: str, context: dict[str, str]) -> str:
+    """Resolve a prefixed target (e.g. dc:title) to a full URI using @context."""
+    if target.startswith(("http://", "https://")):
+        return target
+    prefix, _, local = target.partition(":")
+    base = context.get(prefix)
+    return base + local if local and isinstance(base, str) else target
+
+
+def _uri_key(uri: str) -> str:
+    """Key URIs without their scheme, so http:// and https:// variants match."""
+    return uri.partition("://")[2] or uri
+
+
+class ServiceState:
+    """The compiled schemas and indexed x-mappings of all versions."""
+
+    def __init__(self, root: Path = ROOT):
+        """Load and compile all version directories below root."""
+        self.root = root
+        # Taken first, so changes made while loading trigger another reload.
+        self.fingerprint = fingerprint(root)
+        directories = discover_versions(root)
+        if not directories:
+            raise UnknownSchemaVersionError(f"No schema versions found in {root}")
+        self.registry = SchemaRegistry(root, cache_size=len(directories))
+        self.schemas: dict[str, SchemaVersion] = {version: self.registry.get(version) for version in directories}
+        self.latest = self.registry.latest()
+        self.contexts: dict[str, dict[str, str]] = {}
+        self.x_mapping_errors: dict[str, list[str]] = {}
+        self.mappings: dict[str, list[dict[str, object]]] = {}
+        for version, schema in self.schemas.items():
+            self._index_version(version, schema)
+        self.loaded_at = time.time()
+
+    def _index_version(self, version: str, schema: SchemaVersion) -> None:
+        root = schema.document(ROOT_SCHEMA)
+        context = root.get("@context")
+        context = context if isinstance(context, dict) else {}
+        self.contexts[version] = context
+        namespaces = set(context)
+        for filepath in sorted(schema.directory.glob("*.json")):
+            document = schema.document(filepath.name)
+            element = "case-study" if filepath.name == ROOT_SCHEMA else filepath.stem
+            found: list[tuple[str | None, object]] = []
+            if "x-mappings" in document:
+                found.append((None, document["x-mappings"]))
+            properties = document.get("properties")
+            for name, prop in (properties if isinstance(properties, dict) else {}).items():
+                if isinstance(prop, dict) and "x-mappings" in prop:
+                    found.append((name, prop["x-mappings"]))
+            for prop_name, xm in found:
+                errors = x_mappings.validate_x_mappings(xm, namespaces)
+                if errors:
+                    label = f"{filepath.parent.name}/{filepath.name}" + (f"#{prop_name}" if prop_name else "")
+                    self.x_mapping_errors[label] = [error.strip() for error in errors]
+                if isinstance(xm, dict):
+                    self._index_mappings(version, filepath.name, element, prop_name, xm)
+
+    def _index_mappings(
+        self, version: str, filename: str, element: str, prop_name: str | None, xm: dict[str, object]
+    ) -> None:
+        for vocabulary, entries in xm.items():
+            if vocabulary.startswith("$"):
+                continue
+            for entry in entries if isinstance(entries, list) else [entries]:
+                if not isinstance(entry, dict) or not isinstance(entry.get("target"), str):
+                    continue
+                uri = resolve_uri(entry["target"], self.contexts[version])
+                self.mappings.setdefault(_uri_key(uri), []).append(
+                    {
+                        "version": version,
+                        "element": element,
+                        "property": prop_name,
+                        "file": filename,
+                        "vocabulary": vocabulary,
+                        "relation": entry.get("relation"),
+                        "target": entry["target"],
+                        "uri": uri,
+                    }
+                )
+
+    def schema(self, version: str | None) -> SchemaVersion:
+        """Return the compiled schema of a version (default: latest)."""
+        if version is None:
+            return self.schemas[self.latest]
+        if version not in self.schemas:
+            raise HTTPError(404, f"Unknown schema version '{version}', available: {list(self.schemas)}")
+        return self.schemas[version]
+
+    def crosswalk(self, target: str, version: str | None = None) -> list[dict[str, object]]:
+        """Return the schema elements mapped to a prefixed term or URI."""
+        versions = [self.schema(version).version] if version else list(self.schemas)
+        keys = {_uri_key(resolve_uri(target, self.contexts[v])) for v in versions}
+        return [
+            mapping
+            for key in sorted(keys)
+            for mapping in self.mappings.get(key, [])
+            if version is None or mapping["version"] == version
+        ]
+
+
+# ─── Metrics ──────────────────────────────────────────────
+
+
+class Metrics:
+    """Request counts and latency histograms per route."""
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.requests: Counter[tuple[str, int]] = Counter()
+        self.buckets: dict[str, list[int]] = {}
+        self.latency_sum: Counter[str] = Counter()
+        self.instances: Counter[str] = Counter()
+        self.reloads: Counter[str] = Counter()
+        self.in_flight = 0
+        self.connections = 0
+        self.dropped = 0
+
+    def observe(self, route: str, status: int, seconds: float) -> None:
+        """Record a finished request."""
+        self.requests[(route, status)] += 1
+        buckets = self.buckets.setdefault(route, [0] * (len(LATENCY_BUCKETS) + 1))
+        buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum[route] += seconds
+
+    def render(self, state: ServiceState) -> str:
+        """Return all metrics in the Prometheus text format."""
+        lines = [
+            "# HELP quadriga_requests_total HTTP requests by route and status.",
+            "# TYPE quadriga_requests_total counter",
+        ]
+        for (route, status), count in sorted(self.requests.items()):
+            lines.append(f'quadriga_requests_total{{route="{route}",status="{status}"}} {count}')
+        lines += [
+            "# HELP quadriga_request_duration_seconds Request latency by route.",
+            "# TYPE quadriga_request_duration_seconds histogram",
+        ]
+        for route, buckets in sorted(self.buckets.items()):
+            cumulative = 0
+            for bound, count in zip([*LATENCY_BUCKETS, "+Inf"], buckets):
+                cumulative += count
+                lines.append(f'quadriga_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+            lines.append(f'quadriga_request_duration_seconds_sum{{route="{route}"}} {self.latency_sum[route]:.6f}')
+            lines.append(f'quadriga_request_duration_seconds_count{{route="{route}"}} {cumulative}')
+        lines += [
+            "# HELP quadriga_instances_validated_total Validated instances by result.",
+            "# TYPE quadriga_instances_validated_total counter",
+        ]
+        lines += [f'quadriga_instances_validated_total{{result="{k}"}} {v}' for k, v in sorted(self.instances.items())]
+        lines += [
+            "# HELP quadriga_schema_reloads_total Schema reloads by result.",
+            "# TYPE quadriga_schema_reloads_total counter",
+        ]
+        lines += [f'quadriga_schema_reloads_total{{result="{k}"}} {v}' for k, v in sorted(self.reloads.items())]
+        lines += [
+            "# HELP quadriga_requests_dropped_total Requests whose client disconnected before sending the body.",
+            "# TYPE quadriga_requests_dropped_total counter",
+            f"quadriga_requests_dropped_total {self.dropped}",
+            "# TYPE quadriga_requests_in_flight gauge",
+            f"quadriga_requests_in_flight {self.in_flight}",
+            "# TYPE quadriga_open_connections gauge",
+            f"quadriga_open_connections {self.connections}",
+            "# TYPE quadriga_schema_versions_loaded gauge",
+            f"quadriga_schema_versions_loaded {len(state.schemas)}",
+            "# TYPE quadriga_schemas_loaded_timestamp_seconds gauge",
+            f"quadriga_schemas_loaded_timestamp_seconds {state.loaded_at:.3f}",
+            "# TYPE quadriga_start_timestamp_seconds gauge",
+            f"quadriga_start_timestamp_seconds {self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# ─── HTTP ─────────────────────────────────────────────────
+
+
+class Request:
+    """A parsed HTTP request."""
+
+    def __init__(self, method: str, target: str, version: str, headers: dict[str, str]):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.body = b""
+        self.body_read = False
+        connection = headers.get("connection", "").lower()
+        self.keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request:
+    """Read the request line and headers of the next request on a connection."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large") from None
+    request_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return Request(parts[0], parts[1], parts[2], headers)
+
+
+async def read_body(
+    request: Request, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, limit: int
+) -> bytes:
+    """Read the body of a request (Content-Length or chunked)."""
+    chunked = "chunked" in request.headers.get("transfer-encoding", "").lower()
+    length = request.headers.get("content-length", "")
+    if not chunked:
+        if not length:
+            return b""
+        if not length.isdigit():
+            raise HTTPError(400, "Malformed Content-Length")
+        if int(length) > limit:
+            raise HTTPError(413, f"Request body larger than {limit} bytes")
+    if request.headers.get("expect", "").lower() == "100-continue":
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+    if not chunked:
+        return await reader.readexactly(int(length))
+
+    parts: list[bytes] = []
+    total = 0
+    while True:
+        size_field = (await _read_chunk_line(reader)).split(b";")[0].strip()
+        if not size_field or size_field.strip(HEX_DIGITS):
+            raise HTTPError(400, "Malformed chunk size")
+        size = int(size_field, 16)
+        if size == 0:
+            while await _read_chunk_line(reader) != b"\r\n":
+                pass  # Skip trailers.
+            return b"".join(parts)
+        total += size
+        if total > limit:
+            raise HTTPError(413, f"Request body larger than {limit} bytes")
+        parts.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def _read_chunk_line(reader: asyncio.StreamReader) -> bytes:
+    """Read a chunk-size or trailer line of a chunked body."""
+    try:
+        return await reader.readuntil(b"\r\n")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(400, "Chunk line too long") from None
+
+
+def parse_body(body: bytes, suffix: str) -> list[Any]:
+    """Parse the documents of a request body; a top-level JSON array is returned as a list.
+
+    Runs in a worker thread. A JSON array is decoded item by item: a single
+    json.loads of a large array holds the GIL until it is done and would
+    stall the event loop just the same.
+    """
+    if suffix != ".json":
+        return list(parse_instances(body, suffix))
+    text = body.decode(json.detect_encoding(body), "surrogatepass")
+    index = JSON_WHITESPACE.match(text).end()  # type: ignore[union-attr]
+    if not text.startswith("[", index):
+        return [json.loads(text)]
+    decoder = json.JSONDecoder()
+    items: list[Any] = []
+    index = JSON_WHITESPACE.match(text, index + 1).end()  # type: ignore[union-attr]
+    if text.startswith("]", index):
+        index += 1
+    else:
+        while True:
+            item, index = decoder.raw_decode(text, index)
+            items.append(item)
+            index = JSON_WHITESPACE.match(text, index).end()  # type: ignore[union-attr]
+            if text.startswith("]", index):
+                index += 1
+                break
+            if not text.startswith(",", index):
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+            index = JSON_WHITESPACE.match(text, index + 1).end()  # type: ignore[union-attr]
+    index = JSON_WHITESPACE.match(text, index).end()  # type: ignore[union-attr]
+    if index != len(text):
+        raise json.JSONDecodeError("Extra data", text, index)
+    return [items]
+
+
+def encode_json(payload: dict[str, Any]) -> bytes:
+    """Encode a response body; the items of a batch's "results" are encoded one by one.
+
+    Runs in a worker thread, like parse_body and for the same reason.
+    """
+    results = payload.get("results")
+    if not isinstance(results, list):
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = json.dumps({key: value for key, value in payload.items() if key != "results"}, ensure_ascii=False)
+    items = ", ".join(json.dumps(result, ensure_ascii=False) for result in results)
+    separator = ", " if len(head) > 2 else ""
+    return f'{head[:-1]}{separator}"results": [{items}]}}'.encode("utf-8")
+
+
+def encode_response(
+    status: int, body: bytes, content_type: str, keep_alive: bool, keep_alive_timeout: float
+) -> bytes:
+    """Return the serialized HTTP response."""
+    head = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+    ]
+    if keep_alive:
+        head += ["Connection: keep-alive", f"Keep-Alive: timeout={int(keep_alive_timeout)}"]
+    else:
+        head.append("Connection: close")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _suffix(content_type: str) -> str:
+    """Return the instance file suffix matching a request Content-Type."""
+    content_type = content_type.split(";")[0].strip().lower()
+    if "ndjson" in content_type or "jsonl" in content_type or "json-seq" in content_type:
+        return ".ndjson"
+    if "yaml" in content_type or "yml" in content_type:
+        return ".yml"
+    return ".json"
+
+
+class SchemaServer:
+    """The asyncio HTTP server with the loaded schemas."""
+
+    def __init__(self, args: argparse.Namespace, state: ServiceState):
+        self.args = args
+        self.state = state
+        self.metrics = Metrics()
+        self.semaphore = asyncio.Semaphore(args.max_concurrency)
+        self.connections: dict[asyncio.Task[None], bool] = {}  # task -> busy
+        self.closing = False
+        self._reload_lock = asyncio.Lock()
+
+    # ─── Connections ───
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one (keep-alive) connection."""
+        task = asyncio.current_task()
+        assert task is not None
+        self.connections[task] = False
+        self.metrics.connections += 1
+        try:
+            while not self.closing:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), self.args.keep_alive_timeout)
+                except HTTPError as e:
+                    writer.write(self._error_response(e, keep_alive=False))
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                self.connections[task] = True
+                keep_alive = await self.handle_request(request, reader, writer)
+                await writer.drain()
+                self.connections[task] = False
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            if self.connections.get(task):
+                raise
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+            self.connections.pop(task, None)
+            self.metrics.connections -= 1
+
+    async def handle_request(
+        self, request: Request, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        """Answer one request; return whether the connection stays open."""
+        start = time.perf_counter()
+        route = request.path if request.path in ROUTES else "other"
+        keep_alive = request.keep_alive
+        self.metrics.in_flight += 1
+        try:
+            # The body is read before waiting for the semaphore, so a slow
+            # upload does not hold one of the --max-concurrency slots.
+            await self._read_body(request, reader, writer)
+            if route in ("/health", "/metrics"):
+                status, body, content_type = self.dispatch(request, self.state)
+            else:
+                async with self.semaphore:
+                    status, body, content_type = await self.dispatch_async(request, self.state)
+        except HTTPError as e:
+            # The unread body of a rejected request would be taken for the next request.
+            keep_alive = keep_alive and request.body_read
+            status, body, content_type = e.status, self._error_body(e), "application/json"
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # The client went away while sending the body; there is no one to
+            # answer, and it is not a server error. handle_connection closes.
+            self.metrics.dropped += 1
+            raise
+        except Exception as e:  # noqa: BLE001 - answer instead of dropping the connection
+            print(f"ERROR: {request.method} {request.path}: {e!r}", file=sys.stderr)
+            keep_alive = keep_alive and request.body_read
+            status, body, content_type = 500, self._error_body(HTTPError(500, "Internal server error")), "application/json"
+        finally:
+            self.metrics.in_flight -= 1
+        keep_alive = keep_alive and not self.closing
+        writer.write(encode_response(status, body, content_type, keep_alive, self.args.keep_alive_timeout))
+        self.metrics.observe(route, status, time.perf_counter() - start)
+        return keep_alive
+
+    async def _read_body(
+        self, request: Request, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request.body = await asyncio.wait_for(
+                read_body(request, reader, writer, self.args.max_body_bytes), self.args.keep_alive_timeout
+            )
+        except asyncio.TimeoutError:
+            raise HTTPError(408, "Request body not received in time") from None
+        request.body_read = True
+
+    def _error_body(self, error: HTTPError) -> bytes:
+        return json.dumps({"error": error.message}).encode("utf-8")
+
+    def _error_response(self, error: HTTPError, keep_alive: bool) -> bytes:
+        body = self._error_body(error)
+        return encode_response(error.status, body, "application/json", keep_alive, self.args.keep_alive_timeout)
+
+    # ─── Routes ───
+
+    def dispatch(self, request: Request, state: ServiceState) -> tuple[int, bytes, str]:
+        """Answer the requests that never wait: /health and /metrics."""
+        if request.method != "GET":
+            raise HTTPError(405, f"Method {request.method} not allowed")
+        if request.path == "/metrics":
+            return 200, self.metrics.render(state).encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        return self._json(
+            {
+                "status": "ok",
+                "versions": list(state.schemas),
+                "latest": state.latest,
+                "loaded-at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(state.loaded_at)),
+            }
+        )
+
+    async def dispatch_async(self, request: Request, state: ServiceState) -> tuple[int, bytes, str]:
+        """Answer the requests that are subject to the concurrency limit."""
+        key = (request.method, request.path)
+        if key == ("POST", "/validate"):
+            return await self._json_async(await self.validate(request, state))
+        if key == ("POST", "/validate-x-mappings"):
+            return await self._json_async(await self.validate_x_mappings(request, state))
+        if key == ("GET", "/validate-x-mappings"):
+            return self._json({"valid": not state.x_mapping_errors, "errors": state.x_mapping_errors})
+        if key == ("GET", "/crosswalk"):
+            return self._json(self.crosswalk(request, state))
+        if request.path in ROUTES:
+            raise HTTPError(405, f"Method {request.method} not allowed for {request.path}")
+        raise HTTPError(404, f"Not found: {request.path}")
+
+    def _json(self, payload: object) -> tuple[int, bytes, str]:
+        return 200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+
+    async def _json_async(self, payload: dict[str, Any]) -> tuple[int, bytes, str]:
+        return 200, await asyncio.to_thread(encode_json, payload), "application/json; charset=utf-8"
+
+    async def _parse_body(self, request: Request) -> tuple[list[Any], bool]:
+        """Parse the instances of a request body; return them and whether it is a batch."""
+        suffix = _suffix(request.headers.get("content-type", ""))
+        try:
+            documents = await asyncio.to_thread(parse_body, request.body, suffix)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise HTTPError(400, f"Invalid request body: {e}") from None
+        if suffix == ".json" and documents and isinstance(documents[0], list):
+            documents, batch = documents[0], True
+        else:
+            batch = suffix == ".ndjson" or len(documents) != 1
+        if len(documents) > self.args.max_batch:
+            raise HTTPError(413, f"More than {self.args.max_batch} instances in one request")
+        return documents, batch
+
+    async def validate(self, request: Request, state: ServiceState) -> dict[str, object]:
+        """Validate the instances of a request body."""
+        instances, batch = await self._parse_body(request)
+        fixed = state.schema(request.query["version"]) if "version" in request.query else None
+        results = []
+        for index, instance in enumerate(instances):
+            if index and not index % YIELD_EVERY:
+                await asyncio.sleep(0)  # Let other connections progress during large batches.
+            errors = fixed.validate(instance) if fixed else state.registry.validate(instance)
+            version = fixed.version if fixed else instance.get("schema-version") if isinstance(instance, dict) else None
+            results.append({"valid": not errors, "schema-version": version, "errors": errors})
+        invalid = sum(not result["valid"] for result in results)
+        self.metrics.instances["valid"] += len(results) - invalid
+        self.metrics.instances["invalid"] += invalid
+        if not batch:
+            return results[0] if results else {"valid": False, "schema-version": None, "errors": ["No instance"]}
+        return {"valid": not invalid, "count": len(results), "invalid": invalid, "results": results}
+
+    async def validate_x_mappings(self, request: Request, state: ServiceState) -> dict[str, object]:
+        """Validate the x-mappings objects of a request body."""
+        documents, batch = await self._parse_body(request)
+        schema = state.schema(request.query.get("version"))
+        namespaces = set(state.contexts[schema.version])
+        results = []
+        for document in documents:
+            errors = [error.strip() for error in x_mappings.validate_x_mappings(document, namespaces)]
+            results.append({"valid": not errors, "errors": errors})
+        if not batch:
+            return results[0] if results else {"valid": False, "errors": ["No x-mappings object"]}
+        invalid = sum(not result["valid"] for result in results)
+        return {"valid": not invalid, "count": len(results), "invalid": invalid, "results": results}
+
+    def crosswalk(self, request: Request, state: ServiceState) -> dict[str, object]:
+        """Look up the schema elements mapped to a vocabulary term."""
+        target = request.query.get("target")
+        if not target:
+            raise HTTPError(400, "Missing query parameter 'target'")
+        mappings = state.crosswalk(target, request.query.get("version"))
+        for name in ("vocabulary", "relation"):
+            if name in request.query:
+                mappings = [mapping for mapping in mappings if mapping[name] == request.query[name]]
+        return {"target": target, "count": len(mappings), "mappings": mappings}
+
+    # ─── Reloading ───
+
+    async def reload(self, force: bool = False) -> None:
+        """Load the schemas again if a file changed; keep the old ones on errors."""
+        async with self._reload_lock:
+            if not force and fingerprint(self.state.root) == self.state.fingerprint:
+                return
+            try:
+                state = await asyncio.to_thread(ServiceState, self.state.root)
+            except Exception as e:  # noqa: BLE001 - e.g. a schema file saved half-way
+                self.metrics.reloads["error"] += 1
+                print(f"ERROR: Reloading schemas failed, keeping the loaded ones: {e}", file=sys.stderr)
+                # Do not retry until the files change again.
+                self.state.fingerprint = fingerprint(self.state.root)
+                return
+            # Requests in progress keep the state they started with.
+            self.state = state
+            self.metrics.reloads["ok"] += 1
+            print(f"Reloaded schema versions {list(state.schemas)}")
+
+    async def watch(self) -> None:
+        """Poll the schema files for changes."""
+        while True:
+            await asyncio.sleep(self.args.reload_interval)
+            await self.reload()
+
+    async def shutdown(self, server: asyncio.AbstractServer) -> None:
+        """Stop accepting connections, finish requests in progress and close idle connections."""
+        self.closing = True
+        server.close()
+        for task, busy in list(self.connections.items()):
+            if not busy:
+                task.cancel()
+        while self.connections:
+            await asyncio.sleep(0.05)
+
+
+async def serve(args: argparse.Namespace) -> int:
+    """Run the server until SIGINT or SIGTERM."""
+    try:
+        state = await asyncio.to_thread(ServiceState, ROOT)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Cannot load schemas: {e}", file=sys.stderr)
+        return 1
+
+    app = SchemaServer(args, state)
+    server = await asyncio.start_server(app.handle_connection, args.host, args.port, limit=MAX_HEADER_BYTES)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+    if hasattr(signal, "SIGHUP"):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(app.reload(force=True)))
+    watcher = asyncio.create_task(app.watch()) if args.reload_interval > 0 else None
+
+    addresses = ", ".join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"Serving schema versions {list(state.schemas)} on {addresses}")
+    await stop.wait()
+
+    print("Shutting down...")
+    if watcher:
+        watcher.cancel()
+    await app.shutdown(server)
+    await server.wait_closed()
+    return 0
+
+
+def main() -> int:
+    """Serve QUADRIGA metadata validation and crosswalk lookups."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--max-batch", type=int, default=10000)
+    parser.add_argument("--max-body-bytes", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--keep-alive-timeout", type=float, default=15.0)
+    parser.add_argument("--reload-interval", type=float, default=2.0)
+    args = parser.parse_args()
+    return asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
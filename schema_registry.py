@@ -0,0 +1,506 @@
+"""
+In-process registry of all QUADRIGA schema versions.
+
+The registry discovers the version directories (v1.0.0/, v1.1.0/, ...) next
+to this file. Each version's schema graph is loaded and compiled into
+validator functions on first use, and the compiled versions are kept in a
+size-bounded LRU cache. Instances are dispatched to the right version based on
+their `schema-version` field, so workers handling mixed-version traffic do not
+reload a schema per record:
+
+    registry = SchemaRegistry()
+    errors = registry.validate(instance)  # [] if the instance is valid
+
+The validator only depends on the standard library and supports the subset of
+JSON Schema 2020-12 used by the QUADRIGA schema files ($ref, type, enum,
+const, properties, required, additionalProperties, patternProperties,
+min/maxProperties, items, min/maxItems, uniqueItems, allOf, anyOf, oneOf, not,
+pattern, min/maxLength and the formats date, uri and duration).
+
+Unlike the JSON Schema 2020-12 default, in which `format` is only an
+annotation, the formats date, uri and duration are enforced: an instance with
+e.g. `date-issued: 2024-13-01` is invalid here. Other validators only agree
+with this registry when format assertion is enabled, e.g. jsonschema with
+`format_checker=Draft202012Validator.FORMAT_CHECKER` (its duration check needs
+the isoduration package).
+"""
+
+import datetime
+import json
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from urllib.parse import unquote, urldefrag, urljoin
+
+ROOT = Path(__file__).resolve().parent
+ROOT_SCHEMA = "schema.json"
+VERSION_DIR_PATTERN = re.compile(r"^v(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?$")
+DEFAULT_CACHE_SIZE = 4
+
+# A validator takes an instance and its path (for error messages) and returns
+# the list of validation errors, which is empty for valid instances.
+Validator = Callable[[object, str], list[str]]
+
+DURATION_PATTERN = re.compile(
+    r"^P(?!$)(?:(\d+)Y)?(?:(\d+)M)?(?:(\d+)W)?(?:(\d+)D)?"
+    r"(?:T(?=\d)(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?$"
+)
+URI_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:[^\s]*$")
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Calendar units have no fixed length; these are the usual approximations.
+DURATION_UNIT_SECONDS = (365 * 86400, 30 * 86400, 7 * 86400, 86400, 3600, 60, 1)
+
+
+class UnknownSchemaVersionError(KeyError):
+    """Raised when no version directory exists for a requested schema version."""
+
+
+def parse_duration(value: str) -> float | None:
+    """Return an ISO 8601 duration (e.g. 'PT1H30M') in seconds, or None if invalid.
+
+    Years and months are counted as 365 and 30 days.
+    """
+    match = DURATION_PATTERN.match(value)
+    if match is None:
+        return None
+    return sum(
+        float(part) * seconds
+        for part, seconds in zip(match.groups(), DURATION_UNIT_SECONDS)
+        if part is not None
+    )
+
+
+def _check_date(value: str) -> bool:
+    if not DATE_PATTERN.match(value):
+        return False
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+FORMAT_CHECKERS: dict[str, Callable[[str], bool]] = {
+    "date": _check_date,
+    "duration": lambda value: DURATION_PATTERN.match(value) is not None,
+    "uri": lambda value: URI_PATTERN.match(value) is not None,
+}
+
+TYPE_CHECKERS: dict[str, Callable[[object], bool]] = {
+    "array": lambda value: isinstance(value, list),
+    "boolean": lambda value: isinstance(value, bool),
+    "integer": lambda value: (
+        isinstance(value, int) and not isinstance(value, bool)
+        or isinstance(value, float) and value.is_integer()
+    ),
+    "null": lambda value: value is None,
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "object": lambda value: isinstance(value, dict),
+    "string": lambda value: isinstance(value, str),
+}
+
+
+def _describe(value: object) -> str:
+    """Return a short representation of an instance value for error messages."""
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+def _json_equal_key(value: object) -> str:
+    """Return a key that is equal for JSON-equal values (used for uniqueItems)."""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def _child(path: str, key: str | int) -> str:
+    """Extend an instance path by an object key or array index."""
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else key
+
+
+class SchemaCompiler:
+    """Compile the schema documents of one version into validator functions."""
+
+    def __init__(self, documents: dict[str, dict[str, object]]):
+        """Create a compiler for the documents, keyed by their absolute $id."""
+        self.documents = documents
+        self._compiled: dict[str, Validator] = {}
+
+    def compile_uri(self, uri: str) -> Validator:
+        """Return the validator for a (possibly fragment-qualified) schema URI."""
+        if uri not in self._compiled:
+            # Register a forwarding stub first so recursive $refs terminate.
+            target: list[Validator] = []
+            self._compiled[uri] = lambda instance, path: target[0](instance, path)
+            document_uri, fragment = urldefrag(uri)
+            if document_uri not in self.documents:
+                raise KeyError(f"Unresolvable $ref: {uri}")
+            node = self._resolve_pointer(self.documents[document_uri], fragment)
+            target.append(self.compile(node, document_uri))
+            self._compiled[uri] = target[0]
+        return self._compiled[uri]
+
+    @staticmethod
+    def _resolve_pointer(document: object, fragment: str) -> object:
+        node = document
+        for token in fragment.lstrip("/").split("/") if fragment else []:
+            token = unquote(token).replace("~1", "/").replace("~0", "~")
+            node = node[int(token)] if isinstance(node, list) else node[token]  # type: ignore[index]
+        return node
+
+    def compile(self, schema: object, base_uri: str) -> Validator:
+        """Compile a schema node; $refs are resolved against base_uri."""
+        if schema is True or schema == {}:
+            return lambda instance, path: []
+        if schema is False:
+            return lambda instance, path: [f"{path or '(root)'}: no value is allowed here"]
+        if not isinstance(schema, dict):
+            raise TypeError(f"Invalid schema node in {base_uri}: {schema!r}")
+
+        if isinstance(schema.get("$id"), str):
+            base_uri = urljoin(base_uri, schema["$id"])
+
+        checks: list[Validator] = []
+        for keywords, build in _KEYWORD_HANDLERS:
+            if not keywords.isdisjoint(schema):
+                checks.append(build(self, schema, base_uri))
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def validate(instance: object, path: str) -> list[str]:
+            errors: list[str] = []
+            for check in checks:
+                errors.extend(check(instance, path))
+            return errors
+
+        return validate
+
+    # ─── Keywords ─────────────────────────────────────────
+
+    def _ref(self, schema: dict, base_uri: str) -> Validator:
+        return self.compile_uri(urljoin(base_uri, schema["$ref"]))
+
+    def _type(self, schema: dict, base_uri: str) -> Validator:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        checkers = [TYPE_CHECKERS[name] for name in types]
+        expected = " or ".join(types)
+
+        def validate(instance: object, path: str) -> list[str]:
+            if any(check(instance) for check in checkers):
+                return []
+            return [f"{path or '(root)'}: expected {expected}, got {_describe(instance)}"]
+
+        return validate
+
+    def _enum(self, schema: dict, base_uri: str) -> Validator:
+        allowed = schema["enum"]
+        keys = {_json_equal_key(value) for value in allowed}
+
+        def validate(instance: object, path: str) -> list[str]:
+            if _json_equal_key(instance) in keys:
+                return []
+            return [f"{path or '(root)'}: {_describe(instance)} is not one of {allowed}"]
+
+        return validate
+
+    def _const(self, schema: dict, base_uri: str) -> Validator:
+        key = _json_equal_key(schema["const"])
+
+        def validate(instance: object, path: str) -> list[str]:
+            if _json_equal_key(instance) == key:
+                return []
+            return [f"{path or '(root)'}: must be {_describe(schema['const'])}"]
+
+        return validate
+
+    def _properties(self, schema: dict, base_uri: str) -> Validator:
+        properties = {
+            name: self.compile(subschema, base_uri)
+            for name, subschema in schema.get("properties", {}).items()
+        }
+        patterns = [
+            (re.compile(pattern), self.compile(subschema, base_uri))
+            for pattern, subschema in schema.get("patternProperties", {}).items()
+        ]
+        additional = schema.get("additionalProperties", True)
+        check_additional = None if additional is True else self.compile(additional, base_uri)
+        required = schema.get("required", [])
+        min_properties = schema.get("minProperties")
+        max_properties = schema.get("maxProperties")
+
+        def validate(instance: object, path: str) -> list[str]:
+            if not isinstance(instance, dict):
+                return []
+            errors: list[str] = []
+            for name in required:
+                if name not in instance:
+                    errors.append(f"{path or '(root)'}: missing required property '{name}'")
+            if min_properties is not None and len(instance) < min_properties:
+                errors.append(f"{path or '(root)'}: must have at least {min_properties} properties")
+            if max_properties is not None and len(instance) > max_properties:
+                errors.append(f"{path or '(root)'}: must have at most {max_properties} properties")
+            for name, value in instance.items():
+                matched = False
+                check = properties.get(name)
+                if check is not None:
+                    matched = True
+                    errors.extend(check(value, _child(path, name)))
+                for pattern, check in patterns:
+                    if pattern.search(name):
+                        matched = True
+                        errors.extend(check(value, _child(path, name)))
+                if not matched and check_additional is not None:
+                    if additional is False:
+                        errors.append(f"{path or '(root)'}: unexpected property '{name}'")
+                    else:
+                        errors.extend(check_additional(value, _child(path, name)))
+            return errors
+
+        return validate
+
+    def _items(self, schema: dict, base_uri: str) -> Validator:
+        check_item = self.compile(schema.get("items", True), base_uri)
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+        unique = schema.get("uniqueItems", False)
+
+        def validate(instance: object, path: str) -> list[str]:
+            if not isinstance(instance, list):
+                return []
+            errors: list[str] = []
+            if min_items is not None and len(instance) < min_items:
+                errors.append(f"{path or '(root)'}: must have at least {min_items} item(s)")
+            if max_items is not None and len(instance) > max_items:
+                errors.append(f"{path or '(root)'}: must have at most {max_items} item(s)")
+            if unique and len({_json_equal_key(item) for item in instance}) != len(instance):
+                errors.append(f"{path or '(root)'}: items must be unique")
+            for index, item in enumerate(instance):
+                errors.extend(check_item(item, _child(path, index)))
+            return errors
+
+        return validate
+
+    def _string(self, schema: dict, base_uri: str) -> Validator:
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        check_format = FORMAT_CHECKERS.get(schema.get("format", ""))
+        format_name = schema.get("format")
+
+        def validate(instance: object, path: str) -> list[str]:
+            if not isinstance(instance, str):
+                return []
+            errors: list[str] = []
+            if min_length is not None and len(instance) < min_length:
+                errors.append(f"{path or '(root)'}: must be at least {min_length} character(s) long")
+            if max_length is not None and len(instance) > max_length:
+                errors.append(f"{path or '(root)'}: must be at most {max_length} character(s) long")
+            if pattern is not None and not pattern.search(instance):
+                errors.append(f"{path or '(root)'}: {_describe(instance)} does not match '{pattern.pattern}'")
+            if check_format is not None and not check_format(instance):
+                errors.append(f"{path or '(root)'}: {_describe(instance)} is not a valid {format_name}")
+            return errors
+
+        return validate
+
+    def _all_of(self, schema: dict, base_uri: str) -> Validator:
+        checks = [self.compile(subschema, base_uri) for subschema in schema["allOf"]]
+
+        def validate(instance: object, path: str) -> list[str]:
+            errors: list[str] = []
+            for check in checks:
+                errors.extend(check(instance, path))
+            return errors
+
+        return validate
+
+    def _any_of(self, schema: dict, base_uri: str) -> Validator:
+        checks = [self.compile(subschema, base_uri) for subschema in schema["anyOf"]]
+
+        def validate(instance: object, path: str) -> list[str]:
+            if any(not check(instance, path) for check in checks):
+                return []
+            return [f"{path or '(root)'}: {_describe(instance)} matches none of the allowed alternatives"]
+
+        return validate
+
+    def _one_of(self, schema: dict, base_uri: str) -> Validator:
+        checks = [self.compile(subschema, base_uri) for subschema in schema["oneOf"]]
+
+        def validate(instance: object, path: str) -> list[str]:
+            branch_errors = [check(instance, path) for check in checks]
+            matched = sum(1 for errors in branch_errors if not errors)
+            if matched == 1:
+                return []
+            if matched > 1:
+                return [f"{path or '(root)'}: {_describe(instance)} matches more than one alternative"]
+            # Report the errors of the closest alternative to keep messages useful.
+            closest = min(branch_errors, key=len)
+            return [
+                f"{path or '(root)'}: {_describe(instance)} matches none of the allowed alternatives",
+                *closest,
+            ]
+
+        return validate
+
+    def _not(self, schema: dict, base_uri: str) -> Validator:
+        check = self.compile(schema["not"], base_uri)
+
+        def validate(instance: object, path: str) -> list[str]:
+            if check(instance, path):
+                return []
+            return [f"{path or '(root)'}: {_describe(instance)} is not allowed here"]
+
+        return validate
+
+
+# Keyword handlers in evaluation order. Keywords that are evaluated together
+# (e.g. properties, required and additionalProperties) share one handler.
+_KEYWORD_HANDLERS: list[tuple[frozenset[str], Callable[[SchemaCompiler, dict, str], Validator]]] = [
+    (frozenset({"$ref"}), SchemaCompiler._ref),
+    (frozenset({"type"}), SchemaCompiler._type),
+    (frozenset({"enum"}), SchemaCompiler._enum),
+    (frozenset({"const"}), SchemaCompiler._const),
+    (
+        frozenset({
+            "properties", "patternProperties", "additionalProperties",
+            "required", "minProperties", "maxProperties",
+        }),
+        SchemaCompiler._properties,
+    ),
+    (frozenset({"items", "minItems", "maxItems", "uniqueItems"}), SchemaCompiler._items),
+    (frozenset({"pattern", "minLength", "maxLength", "format"}), SchemaCompiler._string),
+    (frozenset({"allOf"}), SchemaCompiler._all_of),
+    (frozenset({"anyOf"}), SchemaCompiler._any_of),
+    (frozenset({"oneOf"}), SchemaCompiler._one_of),
+    (frozenset({"not"}), SchemaCompiler._not),
+]
+
+
+class SchemaVersion:
+    """The loaded and compiled schema graph of one version directory."""
+
+    def __init__(self, version: str, directory: Path):
+        """Load all schema documents of a version directory and compile the root schema."""
+        self.version = version
+        self.directory = directory
+        self.documents: dict[str, dict[str, object]] = {}
+        for filepath in sorted(directory.glob("*.json")):
+            with filepath.open(encoding="utf-8") as f:
+                document = json.load(f)
+            self.documents[document.get("$id", filepath.resolve().as_uri())] = document
+        root = self.document(ROOT_SCHEMA)
+        self.root_id: str = root.get("$id", (directory / ROOT_SCHEMA).resolve().as_uri())  # type: ignore[assignment]
+        self._compiler = SchemaCompiler(self.documents)
+        self._validate = self._compiler.compile_uri(self.root_id)
+
+    def document(self, filename: str) -> dict[str, object]:
+        """Return a parsed schema document by its file name (e.g. 'chapter.json')."""
+        for schema_id, document in self.documents.items():
+            if schema_id.rsplit("/", 1)[-1] == filename:
+                return document
+        raise KeyError(f"{filename} not found in {self.directory}")
+
+    def validator(self, filename: str = ROOT_SCHEMA) -> Validator:
+        """Return the compiled validator of one schema document of this version."""
+        return self._compiler.compile_uri(urljoin(self.root_id, filename))
+
+    def validate(self, instance: object) -> list[str]:
+        """Validate an instance against the root schema of this version."""
+        return self._validate(instance, "")
+
+    def is_valid(self, instance: object) -> bool:
+        """Return whether an instance is valid against this version."""
+        return not self._validate(instance, "")
+
+
+class SchemaRegistry:
+    """Discover schema versions and hand out compiled versions from an LRU cache."""
+
+    def __init__(self, root: Path = ROOT, cache_size: int = DEFAULT_CACHE_SIZE):
+        """Create a registry for the version directories below root."""
+        self.root = Path(root)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, SchemaVersion] = OrderedDict()
+        self._lock = threading.Lock()
+        self._directories = discover_versions(self.root)
+
+    def versions(self) -> list[str]:
+        """Return all available schema versions, oldest first."""
+        return list(self._directories)
+
+    def latest(self) -> str:
+        """Return the newest available schema version."""
+        if not self._directories:
+            raise UnknownSchemaVersionError(f"No schema versions found in {self.root}")
+        return next(reversed(self._directories))
+
+    def get(self, version: str) -> SchemaVersion:
+        """Return the compiled schema of a version, loading it on first use."""
+        with self._lock:
+            if version in self._cache:
+                self._cache.move_to_end(version)
+                return self._cache[version]
+            if version not in self._directories:
+                raise UnknownSchemaVersionError(
+                    f"Unknown schema version '{version}', available: {self.versions()}"
+                )
+        # Compile outside the lock; a concurrent duplicate load is harmless.
+        compiled = SchemaVersion(version, self._directories[version])
+        with self._lock:
+            self._cache[version] = compiled
+            self._cache.move_to_end(version)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compiled
+
+    def for_instance(self, instance: object) -> SchemaVersion:
+        """Return the compiled schema an instance declares in `schema-version`."""
+        version = instance.get("schema-version") if isinstance(instance, dict) else None
+        if not isinstance(version, str):
+            raise UnknownSchemaVersionError("Instance has no 'schema-version' string")
+        return self.get(version)
+
+    def validate(self, instance: object) -> list[str]:
+        """Validate an instance against the version it declares."""
+        try:
+            schema = self.for_instance(instance)
+        except UnknownSchemaVersionError as e:
+            return [f"schema-version: {e.args[0]}"]
+        return schema.validate(instance)
+
+    def cached_versions(self) -> list[str]:
+        """Return the currently compiled versions, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+
+def _version_key(match: re.Match[str]) -> tuple[object, ...]:
+    """Return a sort key for a matched version directory by semver precedence.
+
+    A pre-release (1.1.0-rc.1) sorts before its release (1.1.0); pre-release
+    identifiers are compared numerically if they are numbers, otherwise
+    lexically, and numbers sort before other identifiers.
+    """
+    major, minor, patch, prerelease = match.groups()
+    if prerelease is None:
+        return (int(major), int(minor), int(patch), 1, ())
+    identifiers = tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part) for part in prerelease.split(".")
+    )
+    return (int(major), int(minor), int(patch), 0, identifiers)
+
+
+def discover_versions(root: Path = ROOT) -> dict[str, Path]:
+    """Find all version directories with a schema.json, ordered by version."""
+    found: list[tuple[tuple[object, ...], str, Path]] = []
+    for directory in root.glob("v*"):
+        match = VERSION_DIR_PATTERN.match(directory.name)
+        if match and directory.is_dir() and (directory / ROOT_SCHEMA).exists():
+            found.append((_version_key(match), directory.name[1:], directory))
+    return {version: directory for _, version, directory in sorted(found)}
+
@@ -0,0 +1,107 @@
+"""Behaviour tests for the migration steps and their composition in migrations.py."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instance_io import split_path, values_at  # noqa: E402
+from migrations import (  # noqa: E402
+    Migration,
+    Migrator,
+    NoMigrationPathError,
+    changed_fields,
+    map_values,
+    remove,
+    rename,
+    set_default,
+)
+
+
+class PathTests(unittest.TestCase):
+    def test_split_path(self) -> None:
+        self.assertEqual(split_path("chapters[].title"), ["chapters", "[]", "title"])
+        self.assertEqual(split_path("matrix[][]"), ["matrix", "[]", "[]"])
+        self.assertEqual(split_path(""), [])
+
+    def test_values_at(self) -> None:
+        instance = {"chapters": [{"title": "A"}, {"url": "x"}, "no object", {"title": "B"}]}
+        self.assertEqual(values_at(instance, split_path("chapters[].title")), ["A", "B"])
+        self.assertEqual(values_at(instance, split_path("missing[].title")), [])
+
+
+class StepTests(unittest.TestCase):
+    def test_rename_keeps_position(self) -> None:
+        instance = {"a": 1, "old": 2, "c": 3}
+        rename("old", "new")(instance)
+        self.assertEqual(list(instance.items()), [("a", 1), ("new", 2), ("c", 3)])
+
+    def test_rename_in_arrays(self) -> None:
+        instance = {"chapters": [{"learning-goals": ["x"]}, {}]}
+        rename("chapters[].learning-goals", "learning-objectives")(instance)
+        self.assertEqual(instance, {"chapters": [{"learning-objectives": ["x"]}, {}]})
+
+    def test_rename_onto_existing_property_fails(self) -> None:
+        instance = {"old": 1, "new": 2}
+        with self.assertRaises(ValueError):
+            rename("old", "new")(instance)
+        self.assertEqual(instance, {"old": 1, "new": 2})
+        rename("same", "same")(instance)
+
+    def test_set_default(self) -> None:
+        instance = {"chapters": [{"title": "A"}, {"title": "B", "language": "en"}]}
+        set_default("chapters[].language", lambda chapter: "de")(instance)
+        self.assertEqual([chapter["language"] for chapter in instance["chapters"]], ["de", "en"])
+        default = ["x"]
+        set_default("keywords", default)(instance)
+        self.assertIsNot(instance["keywords"], default)
+
+    def test_map_values(self) -> None:
+        instance = {"level": "Remember", "levels": ["Remember", "other", {"a": 1}]}
+        map_values("level", {"Remember": "remember"})(instance)
+        map_values("levels", {"Remember": "remember"})(instance)
+        self.assertEqual(instance, {"level": "remember", "levels": ["remember", "other", {"a": 1}]})
+
+    def test_remove(self) -> None:
+        instance = {"a": 1, "chapters": [{"b": 2}, {}]}
+        remove("chapters[].b")(instance)
+        remove("missing")(instance)
+        self.assertEqual(instance, {"a": 1, "chapters": [{}, {}]})
+
+    def test_path_must_end_with_a_property(self) -> None:
+        with self.assertRaises(ValueError):
+            remove("chapters[]")
+
+
+class MigratorTests(unittest.TestCase):
+    MIGRATIONS = [
+        Migration("1.0.0", "1.1.0", [rename("old", "new")]),
+        Migration("1.1.0", "1.2.0", [set_default("added", "x")]),
+        Migration("1.0.0", "0.9.0", [remove("new")]),
+    ]
+
+    def test_composes_chain_and_sets_version(self) -> None:
+        migrator = Migrator("1.2.0", self.MIGRATIONS)
+        instance = {"schema-version": "1.0.0", "old": 1}
+        self.assertEqual(migrator.migrate(instance), {"schema-version": "1.2.0", "new": 1, "added": "x"})
+        self.assertEqual(migrator.migrate({"schema-version": "1.2.0"}), {"schema-version": "1.2.0"})
+
+    def test_missing_path_or_version(self) -> None:
+        migrator = Migrator("1.2.0", self.MIGRATIONS)
+        with self.assertRaises(NoMigrationPathError):
+            migrator.migrate({"schema-version": "0.9.0"})
+        with self.assertRaises(NoMigrationPathError):
+            migrator.migrate({})
+
+    def test_changed_fields(self) -> None:
+        old = {"a": 1, "b": [{"c": 1}], "d": 1}
+        new = {"a": 2, "b": [{"c": 2}, {}], "e": 1}
+        self.assertEqual(
+            sorted(changed_fields(old, new)),
+            [("+", "b[]"), ("+", "e"), ("-", "d"), ("~", "a"), ("~", "b[].c")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+"""Behaviour tests for the standard-library validator in schema_registry.py."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from schema_registry import (  # noqa: E402
+    SchemaCompiler,
+    SchemaRegistry,
+    UnknownSchemaVersionError,
+    discover_versions,
+    parse_duration,
+)
+
+BASE = "https://example.org/schema/"
+
+
+def compile_schema(schema: dict, *others: dict) -> SchemaCompiler:
+    """Return a compiler for a root schema (and referenced documents)."""
+    documents = {BASE + "root.json": {"$id": BASE + "root.json", **schema}}
+    for document in others:
+        documents[document["$id"]] = document
+    return SchemaCompiler(documents)
+
+
+def errors(schema: dict, instance: object, *others: dict) -> list[str]:
+    """Validate an instance against a root schema."""
+    return compile_schema(schema, *others).compile_uri(BASE + "root.json")(instance, "")
+
+
+class KeywordTests(unittest.TestCase):
+    def assert_valid(self, schema: dict, instance: object, *others: dict) -> None:
+        self.assertEqual(errors(schema, instance, *others), [])
+
+    def assert_invalid(self, schema: dict, instance: object, *others: dict) -> None:
+        self.assertNotEqual(errors(schema, instance, *others), [])
+
+    def test_type(self) -> None:
+        self.assert_valid({"type": "string"}, "text")
+        self.assert_invalid({"type": "string"}, 1)
+        self.assert_valid({"type": ["string", "null"]}, None)
+        self.assert_valid({"type": "integer"}, 2.0)
+        self.assert_invalid({"type": "integer"}, True)
+        self.assert_invalid({"type": "number"}, False)
+        self.assert_valid({"type": "object"}, {})
+        self.assert_invalid({"type": "array"}, {})
+
+    def test_enum_and_const(self) -> None:
+        self.assert_valid({"enum": ["a", 1, {"b": [1, 2]}]}, {"b": [1, 2]})
+        self.assert_invalid({"enum": ["a", 1]}, "b")
+        self.assert_invalid({"enum": [1]}, True)
+        self.assert_valid({"const": {"x": 1, "y": 2}}, {"y": 2, "x": 1})
+        self.assert_invalid({"const": "1.0.0"}, "1.0.1")
+
+    def test_properties(self) -> None:
+        schema = {
+            "properties": {"title": {"type": "string"}},
+            "required": ["title"],
+            "additionalProperties": False,
+        }
+        self.assert_valid(schema, {"title": "T"})
+        self.assert_invalid(schema, {})
+        self.assert_invalid(schema, {"title": 1})
+        self.assert_invalid(schema, {"title": "T", "other": 1})
+        self.assert_valid(schema, "not an object")
+        self.assert_invalid({"additionalProperties": {"type": "integer"}}, {"a": "x"})
+
+    def test_pattern_properties(self) -> None:
+        schema = {"patternProperties": {"^[a-z]{2}$": {"type": "string"}}, "additionalProperties": False}
+        self.assert_valid(schema, {"de": "Text", "en": "Text"})
+        self.assert_invalid(schema, {"de": 1})
+        self.assert_invalid(schema, {"deu": "Text"})
+
+    def test_min_max_properties(self) -> None:
+        self.assert_invalid({"minProperties": 1}, {})
+        self.assert_invalid({"maxProperties": 1}, {"a": 1, "b": 2})
+        self.assert_valid({"minProperties": 1, "maxProperties": 1}, {"a": 1})
+
+    def test_items(self) -> None:
+        schema = {"items": {"type": "string"}, "minItems": 1, "maxItems": 2, "uniqueItems": True}
+        self.assert_valid(schema, ["a", "b"])
+        self.assert_invalid(schema, [])
+        self.assert_invalid(schema, ["a", "b", "c"])
+        self.assert_invalid(schema, ["a", "a"])
+        self.assert_invalid(schema, ["a", 1])
+        self.assert_invalid({"uniqueItems": True}, [{"a": 1, "b": 2}, {"b": 2, "a": 1}])
+
+    def test_strings(self) -> None:
+        self.assert_valid({"minLength": 2, "maxLength": 3}, "abc")
+        self.assert_invalid({"minLength": 2}, "a")
+        self.assert_invalid({"maxLength": 3}, "abcd")
+        self.assert_valid({"pattern": "^[0-9]+$"}, "123")
+        self.assert_invalid({"pattern": "^[0-9]+$"}, "12a")
+        # Patterns are not anchored implicitly.
+        self.assert_valid({"pattern": "[0-9]"}, "a1b")
+        self.assert_valid({"minLength": 5}, 1)
+
+    def test_formats_are_asserted(self) -> None:
+        self.assert_valid({"format": "date"}, "2024-02-29")
+        self.assert_invalid({"format": "date"}, "2023-02-29")
+        self.assert_invalid({"format": "date"}, "2024-1-01")
+        self.assert_valid({"format": "uri"}, "https://example.org/a")
+        self.assert_invalid({"format": "uri"}, "example.org")
+        self.assert_invalid({"format": "uri"}, "https://example.org/a b")
+        self.assert_valid({"format": "duration"}, "PT1H30M")
+        self.assert_valid({"format": "duration"}, "P1Y2M3W4DT5H6M7.5S")
+        self.assert_invalid({"format": "duration"}, "P")
+        self.assert_invalid({"format": "duration"}, "PT")
+        self.assert_invalid({"format": "duration"}, "1H")
+        # Unknown formats are annotations only.
+        self.assert_valid({"format": "email"}, "not an email")
+
+    def test_combinators(self) -> None:
+        self.assert_valid({"allOf": [{"type": "string"}, {"minLength": 1}]}, "a")
+        self.assert_invalid({"allOf": [{"type": "string"}, {"minLength": 2}]}, "a")
+        self.assert_valid({"anyOf": [{"type": "string"}, {"type": "integer"}]}, 1)
+        self.assert_invalid({"anyOf": [{"type": "string"}, {"type": "integer"}]}, None)
+        one_of = {"oneOf": [{"type": "string"}, {"minLength": 3}]}
+        self.assert_valid(one_of, "ab")
+        self.assert_invalid(one_of, "abc")
+        # minLength ignores non-strings, so null matches exactly one alternative.
+        self.assert_valid(one_of, None)
+        self.assert_invalid({"oneOf": [{"type": "string"}, {"type": "integer"}]}, None)
+        self.assert_valid({"not": {"type": "string"}}, 1)
+        self.assert_invalid({"not": {"type": "string"}}, "a")
+
+    def test_boolean_schemas(self) -> None:
+        self.assert_valid({"properties": {"a": True}}, {"a": 1})
+        self.assert_invalid({"properties": {"a": False}}, {"a": 1})
+
+    def test_refs(self) -> None:
+        name = {"$id": BASE + "name.json", "type": "string", "minLength": 1}
+        self.assert_valid({"properties": {"name": {"$ref": "name.json"}}}, {"name": "A"}, name)
+        self.assert_invalid({"properties": {"name": {"$ref": "name.json"}}}, {"name": ""}, name)
+        pointer = {"$defs": {"id": {"type": "integer"}}, "properties": {"id": {"$ref": "#/$defs/id"}}}
+        self.assert_valid(pointer, {"id": 1})
+        self.assert_invalid(pointer, {"id": "1"})
+        with self.assertRaises(KeyError):
+            errors({"$ref": "missing.json"}, {})
+
+    def test_recursive_refs(self) -> None:
+        node = {
+            "$id": BASE + "node.json",
+            "type": "object",
+            "properties": {"children": {"type": "array", "items": {"$ref": "node.json"}}},
+            "additionalProperties": False,
+        }
+        tree = {"children": [{"children": []}, {"children": [{"children": []}]}]}
+        self.assert_valid({"$ref": "node.json"}, tree, node)
+        tree["children"][1]["children"][0]["extra"] = 1  # type: ignore[index]
+        found = errors({"$ref": "node.json"}, tree, node)
+        self.assertEqual(found, ["children[1].children[0]: unexpected property 'extra'"])
+
+    def test_error_paths(self) -> None:
+        schema = {"properties": {"chapters": {"items": {"required": ["title"]}}}}
+        self.assertEqual(
+            errors(schema, {"chapters": [{"title": "A"}, {}]}),
+            ["chapters[1]: missing required property 'title'"],
+        )
+
+    def test_parse_duration(self) -> None:
+        self.assertEqual(parse_duration("PT1H30M"), 5400)
+        self.assertEqual(parse_duration("P1D"), 86400)
+        self.assertIsNone(parse_duration("1 hour"))
+
+
+def write_version(root: Path, version: str) -> None:
+    """Write a minimal version directory requiring its own schema-version."""
+    directory = root / f"v{version}"
+    directory.mkdir()
+    schema = {
+        "$id": f"{BASE}v{version}/schema.json",
+        "type": "object",
+        "properties": {"schema-version": {"const": version}},
+        "required": ["schema-version"],
+    }
+    (directory / "schema.json").write_text(json.dumps(schema), encoding="utf-8")
+
+
+class RegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for version in ("1.0.0", "1.2.0", "1.10.0"):
+            write_version(self.root, version)
+        (self.root / "v2.0.0").mkdir()  # no schema.json, ignored
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_discovery_orders_versions_numerically(self) -> None:
+        self.assertEqual(list(discover_versions(self.root)), ["1.0.0", "1.2.0", "1.10.0"])
+        self.assertEqual(SchemaRegistry(self.root).latest(), "1.10.0")
+
+    def test_discovery_orders_pre_releases_before_their_release(self) -> None:
+        for version in ("1.10.0-rc.10", "1.10.0-rc.2", "1.10.0-beta", "1.11.0-alpha"):
+            write_version(self.root, version)
+        self.assertEqual(
+            list(discover_versions(self.root)),
+            ["1.0.0", "1.2.0", "1.10.0-beta", "1.10.0-rc.2", "1.10.0-rc.10", "1.10.0", "1.11.0-alpha"],
+        )
+
+    def test_dispatch_on_schema_version(self) -> None:
+        registry = SchemaRegistry(self.root)
+        self.assertEqual(registry.validate({"schema-version": "1.2.0"}), [])
+        self.assertEqual(registry.for_instance({"schema-version": "1.0.0"}).version, "1.0.0")
+        self.assertEqual(len(registry.validate({"schema-version": "3.0.0"})), 1)
+        self.assertEqual(len(registry.validate({})), 1)
+        self.assertEqual(len(registry.validate([])), 1)
+        with self.assertRaises(UnknownSchemaVersionError):
+            registry.get("3.0.0")
+
+    def test_lru_eviction(self) -> None:
+        registry = SchemaRegistry(self.root, cache_size=2)
+        first = registry.get("1.0.0")
+        registry.get("1.2.0")
+        self.assertIs(registry.get("1.0.0"), first)
+        self.assertEqual(registry.cached_versions(), ["1.2.0", "1.0.0"])
+        registry.get("1.10.0")  # evicts the least recently used 1.2.0
+        self.assertEqual(registry.cached_versions(), ["1.0.0", "1.10.0"])
+        self.assertIs(registry.get("1.0.0"), first)
+        registry.get("1.2.0")
+        self.assertEqual(registry.cached_versions(), ["1.0.0", "1.2.0"])
+
+    def test_repository_example_is_valid(self) -> None:
+        import yaml
+
+        example = Path(__file__).resolve().parent.parent / "examples" / "minimal_metadata.yml"
+        instance = json.loads(json.dumps(yaml.safe_load(example.read_text(encoding="utf-8")), default=str))
+        self.assertEqual(SchemaRegistry().validate(instance), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Validate QUADRIGA metadata instances against the schema version they declare.
+
+Every instance is dispatched on its `schema-version` field to the matching
+version directory (e.g. v1.0.0/). Each version is loaded and compiled only
+once, no matter how many instances use it.
+
+Requirements:
+  - Python 3.10+
+  - PyYAML for YAML instance files (see requirements.txt)
+
+Usage:
+  python3 validate-instances.py <file-or-directory> [...]
+
+  Files may be YAML (.yml/.yaml), JSON (.json) or NDJSON (.ndjson/.jsonl,
+  one instance per line). Directories are searched recursively.
+
+Exit codes:
+  0 - All instances are valid
+  1 - Validation errors found, unreadable files or script error
+"""
+
+import sys
+
+from instance_io import NDJSON_SUFFIXES, find_instance_files, iter_instances
+from schema_registry import SchemaRegistry
+
+
+def main() -> int:
+    """Validate QUADRIGA metadata instances."""
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <file-or-directory> [...]", file=sys.stderr)
+        return 1
+
+    registry = SchemaRegistry()
+    files = find_instance_files(sys.argv[1:])
+
+    total = 0
+    invalid = 0
+    unreadable = 0
+    for filepath in files:
+        try:
+            for index, instance in iter_instances(filepath):
+                total += 1
+                errors = registry.validate(instance)
+                if errors:
+                    invalid += 1
+                    label = f"{filepath}:{index + 1}" if filepath.suffix in NDJSON_SUFFIXES else str(filepath)
+                    print(f"❌ {label}:")
+                    for error in errors:
+                        print(f"    {error}")
+                    print()
+        except (OSError, ValueError) as e:
+            # Report the file and keep going, so one broken file does not hide the others.
+            unreadable += 1
+            print(f"ERROR: Cannot read {filepath}: {e}", file=sys.stderr)
+
+    print("=" * 60)
+    print("Validation complete:")
+    print(f"  Files checked: {len(files)}")
+    print(f"  Instances checked: {total}")
+    print(f"  Invalid instances: {invalid}")
+    print(f"  Unreadable files: {unreadable}")
+    print(f"  Schema versions used: {registry.cached_versions()}")
+    print("=" * 60)
+
+    if invalid or unreadable:
+        print("\n❌ Validation FAILED")
+        return 1
+
+    print("\n✅ All instances are valid!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())